@@ -11,6 +11,8 @@
 # ==============================CS-199==================================
 
 class Action():
+	# Agents return one Action per move, slots keep them small and quick to build
+	__slots__ = ("__action", "__x", "__y")
 
 	def __init__(self, action, x=1, y=1):
 		""" Default values of x and y are 1 for LEAVE """
@@ -0,0 +1,51 @@
+import importlib
+
+
+class AgentEntry:
+	"""
+	Where to find one agent and how to build it. The agent's module is only
+	imported the first time the agent is loaded.
+	"""
+	def __init__(self, module: str, className: str, boardArgs: bool = True, interactive: bool = False):
+		self.module: str = module
+		self.className: str = className
+		self.boardArgs: bool = boardArgs		# Constructor takes (rows, cols, mines, startX, startY)
+		self.interactive: bool = interactive	# Agent asks the user for every move
+		self.__agentClass: type = None
+
+
+	def load(self) -> type:
+		"""Imports the agent's module and returns its class."""
+		if self.__agentClass is None:
+			self.__agentClass = getattr(importlib.import_module(self.module), self.className)
+		return self.__agentClass
+
+
+	def create(self, rowDimension: int, colDimension: int, totalMines: int, startX: int, startY: int) -> "AI":
+		"""Builds the agent for one game."""
+		if self.boardArgs:
+			return self.load()(rowDimension, colDimension, totalMines, startX, startY)
+		return self.load()()
+
+
+# Agents by the name used on the command line
+AGENTS: dict[str, AgentEntry] = {
+	"myai": AgentEntry("MyAI", "MyAI"),
+	"manual": AgentEntry("ManualAI", "ManualAI", boardArgs=False, interactive=True),
+	"random": AgentEntry("RandomAI", "RandomAI"),
+	"old": AgentEntry("MyAIOld", "MyAI"),
+	"personal": AgentEntry("MyAIPersonal", "MyAI"),
+}
+
+
+def registerAgent(name: str, module: str, className: str, boardArgs: bool = True, interactive: bool = False) -> None:
+	"""Adds an agent, or replaces the one with the same name. Nothing is imported yet."""
+	AGENTS[name] = AgentEntry(module, className, boardArgs, interactive)
+
+
+def getAgent(name: str) -> AgentEntry:
+	"""Returns the registry entry of an agent by name."""
+	entry = AGENTS.get(name)
+	if entry is None:
+		raise ValueError("Unknown agent {}, choose from {}".format(name, ", ".join(AGENTS)))
+	return entry
@@ -0,0 +1,246 @@
+"""
+Benchmark harness for the Minesweeper agents.
+
+Plays every agent on fixed seeded corpora of beginner (8x8, 10 mines),
+intermediate (16x16, 40 mines) and expert (16x30, 99 mines) boards and reports
+win rate, games per second, mean and tail move latency and peak memory. It
+also times the hot paths of MyAI (GameGrid.__adjStateList, __shallowSearch,
+__semiShallowSearch and __guessSafeTile) on positions taken from real games.
+Results can be written as JSON and compared against an earlier run.
+
+	python Benchmark.py [--games N] [--seed S] [--agents NAME ...]
+	                    [--no-micro] [-o results.json] [--compare old.json]
+"""
+
+import argparse
+import copy
+import json
+import platform
+import subprocess
+import time
+import timeit
+import tracemalloc
+
+from Agents import AGENTS
+from Generator import WorldGenerator
+from MoveProfiler import MoveProfiler
+from MyAI import MyAI, GameGrid, SearchType, State
+from Simulator import simulate
+
+BOARDS = {
+	"beginner": (8, 8, 10),
+	"intermediate": (16, 16, 40),
+	"expert": (16, 30, 99),
+}
+
+# Memory is measured on a few games only, tracemalloc slows everything down
+MEMORY_GAMES = 5
+
+
+def agentFactories() -> dict:
+	"""Name -> agent class for every registered agent that can play on its own."""
+	return {name: agent.load() for name, agent in AGENTS.items() if not agent.interactive}
+
+
+def corpus(board: str, games: int, seed: int) -> list:
+	"""Returns the fixed seeded corpus for one board size."""
+	rows, cols, mines = BOARDS[board]
+	return list(WorldGenerator(rows, cols, mines, seed).stream(games))
+
+
+def benchGames(agent, worlds: list) -> dict:
+	"""Plays every world with one agent and returns its statistics."""
+	profiler = MoveProfiler()
+	wins = 0
+	errors = 0
+	start = time.perf_counter()
+	for world in worlds:
+		# Play one world at a time so an agent crashing only loses that game
+		try:
+			for result in simulate(world, agent, profiler):
+				wins += result.won
+		except Exception:
+			errors += 1
+	elapsed = time.perf_counter() - start
+
+	tracemalloc.start()
+	for world in worlds[:MEMORY_GAMES]:
+		try:
+			for _ in simulate(world, agent):
+				pass
+		except Exception:
+			pass
+	_, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	times = sorted(s[0] for samples in profiler.samples.values() for s in samples)
+	return {
+		"games": len(worlds),
+		"wins": wins,
+		"errors": errors,
+		"winRate": wins / len(worlds) if worlds else 0.0,
+		"gamesPerSecond": len(worlds) / elapsed if elapsed else 0.0,
+		"moves": len(times),
+		"meanMoveMs": 1000 * sum(times) / len(times) if times else 0.0,
+		"p50MoveMs": 1000 * MoveProfiler.percentile(times, 50),
+		"p99MoveMs": 1000 * MoveProfiler.percentile(times, 99),
+		"maxMoveMs": 1000 * times[-1] if times else 0.0,
+		"peakMemoryKiB": peak / 1024,
+	}
+
+
+class _SnapshotAI(MyAI):
+	"""MyAI that keeps a copy of itself every few moves, used to get micro-benchmark positions."""
+	snapshots: list = []
+
+	def __init__(self, *args):
+		super().__init__(*args)
+		self.__moves = 0
+
+	def getActions(self, numbers: list[int], revealed: list[tuple[int,int,int]] = None) -> list:
+		actions = super().getActions(numbers, revealed)
+		# Every tenth move, or the first call after it when moves come in batches
+		if self.__moves // 10 != (self.__moves + len(actions)) // 10:
+			_SnapshotAI.snapshots.append(copy.deepcopy(self))
+		self.__moves += len(actions)
+		return actions
+
+
+def benchMicro(seed: int, repeat: int) -> dict:
+	"""Times the MyAI hot paths on mid-game expert positions."""
+	_SnapshotAI.snapshots = []
+	for _ in simulate(corpus("expert", 5, seed), _SnapshotAI):
+		pass
+	agents = _SnapshotAI.snapshots
+
+	# Collect the calls each hot path would receive in those positions
+	adjCalls, oneSafe, oneFlag, semiShallow = [], [], [], []
+	for agent in agents:
+		grid: GameGrid = agent._MyAI__grid
+		for x,y in grid.getFrontierDangerList():
+			adjCalls.append((grid, x, y))
+			danger = grid.getState(x,y)
+			numAdjFlagged = grid.getNumAdjFlagged(x,y)
+			numAdjUnknown = grid.getNumAdjUnknown(x,y)
+			if danger == numAdjFlagged or danger == numAdjFlagged + numAdjUnknown:
+				continue
+			elif danger == numAdjFlagged + numAdjUnknown - 1:
+				oneSafe.append((agent, x, y))
+			elif danger == numAdjFlagged + 1:
+				oneFlag.append((agent, x, y))
+			else:
+				semiShallow.append((agent, x, y))
+
+	def adjStateList():
+		for grid, x, y in adjCalls:
+			grid._GameGrid__adjStateList(x, y, State.UNKNOWN)
+
+	def shallow(calls: list, searchType: SearchType):
+		def run():
+			for agent, x, y in calls:
+				agent._MyAI__shallowSearch(x, y, searchType)
+		return run
+
+	def semi():
+		for agent, x, y in semiShallow:
+			agent._MyAI__semiShallowSearch(x, y)
+
+	def guess():
+		for agent in agents:
+			agent._MyAI__guessSafeTile()
+
+	benches = {
+		"GameGrid.__adjStateList": (adjStateList, len(adjCalls)),
+		"MyAI.__shallowSearch[ONE_SAFE]": (shallow(oneSafe, SearchType.ONE_SAFE), len(oneSafe)),
+		"MyAI.__shallowSearch[ONE_FLAG]": (shallow(oneFlag, SearchType.ONE_FLAG), len(oneFlag)),
+		"MyAI.__semiShallowSearch": (semi, len(semiShallow)),
+		"MyAI.__guessSafeTile": (guess, len(agents)),
+	}
+	results = {}
+	for name, (func, calls) in benches.items():
+		if calls == 0:
+			continue
+		best = min(timeit.repeat(func, number=1, repeat=repeat))
+		results[name] = {"calls": calls, "usPerCall": 1e6 * best / calls}
+	return results
+
+
+def commitId() -> str:
+	"""Returns the current git commit, if there is one."""
+	try:
+		return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def compare(old: dict, new: dict) -> None:
+	"""Prints the change of every shared numeric result between two runs."""
+	print("---------------Compared to {}:---------------".format(old["meta"].get("commit")))
+	for section in ("games", "micro"):
+		for key, newStats in new.get(section, {}).items():
+			oldStats = old.get(section, {}).get(key)
+			if not oldStats:
+				continue
+			for metric, value in newStats.items():
+				before = oldStats.get(metric)
+				if isinstance(value, (int, float)) and before:
+					print("{:<45} {:<16} {:>12.4g} -> {:<12.4g} ({:+.1f}%)".format(key, metric, before, value, 100 * (value - before) / before))
+
+
+def main():
+	parser = argparse.ArgumentParser(description="Benchmark the Minesweeper agents", prog="Benchmark.py")
+	parser.add_argument("--games", help="games per board size", type=int, default=100)
+	parser.add_argument("--seed", help="corpus seed", type=int, default=0)
+	parser.add_argument("--agents", help="agents to run", nargs="*", default=None)
+	parser.add_argument("--repeat", help="micro-benchmark repeats", type=int, default=5)
+	parser.add_argument("--no-micro", help="skip micro-benchmarks", action="store_true")
+	parser.add_argument("-o", "--output", help="write results to this JSON file")
+	parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+	args = parser.parse_args()
+
+	factories = agentFactories()
+	names = args.agents or list(factories)
+	for name in names:
+		if name not in factories:
+			print("ERROR: Unknown agent {}, choose from {}".format(name, ", ".join(factories)))
+			return
+
+	results = {
+		"meta": {
+			"commit": commitId(),
+			"python": platform.python_version(),
+			"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+			"games": args.games,
+			"seed": args.seed,
+		},
+		"games": {},
+	}
+
+	print("{:<24} {:>8} {:>8} {:>10} {:>10} {:>10} {:>10}".format("agent/board", "winRate", "games/s", "mean ms", "p99 ms", "max ms", "peak KiB"))
+	for board in BOARDS:
+		worlds = corpus(board, args.games, args.seed)
+		for name in names:
+			stats = benchGames(factories[name], worlds)
+			results["games"][f"{name}/{board}"] = stats
+			print("{:<24} {:>8.3f} {:>8.1f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.0f}{}".format(
+				f"{name}/{board}", stats["winRate"], stats["gamesPerSecond"], stats["meanMoveMs"],
+				stats["p99MoveMs"], stats["maxMoveMs"], stats["peakMemoryKiB"],
+				"  ({} errors)".format(stats["errors"]) if stats["errors"] else ""
+			))
+
+	if not args.no_micro:
+		results["micro"] = benchMicro(args.seed, args.repeat)
+		for name, stats in results["micro"].items():
+			print("{:<45} {:>8} calls {:>10.2f} us/call".format(name, stats["calls"], stats["usPerCall"]))
+
+	if args.output:
+		with open(args.output, "w") as file:
+			json.dump(results, file, indent=2)
+
+	if args.compare:
+		with open(args.compare) as file:
+			compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+	main()
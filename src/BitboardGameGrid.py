@@ -0,0 +1,234 @@
+from MyAI import State, FrontierIndex
+
+# int.bit_count is only available from Python 3.10
+popcount = int.bit_count if hasattr(int, "bit_count") else lambda mask: bin(mask).count("1")
+
+
+class BitboardGameGrid:
+	"""
+	Bitboard version of `GameGrid` with the same interface.
+
+	Unknown, flagged and uncovered tiles are each kept as one big Python int with
+	a bit per grid space. The board is padded by one space on every side and
+	laid out column by column with a stride of numRows + 2, so the 8 neighbours
+	of bit i are i±1, i±stride and i±stride±1 and shifting a mask never wraps a
+	tile onto the other side of the board. Neighbour counts are a mask and a
+	popcount, and trial mine assignments can be checked against a set of
+	numbered tiles without writing them to the grid (see `getConstraints`).
+
+	Note: When using helper functions, grid indices start at (0, 0).
+	"""
+	def __init__(self, numCols: int, numRows: int):
+		self.__numCols: int = numCols
+		self.__numRows: int = numRows
+		self.__stride: int = numRows + 2
+
+		self.unknownMask: int = 0
+		self.flagMask: int = 0
+		self.uncoveredMask: int = 0
+		for c in range(numCols):
+			for r in range(numRows):
+				self.unknownMask |= self.getTileMask(c, r)
+		# Danger numbers of uncovered spaces, indexed by bit
+		self.__numbers: list[int] = [0] * ((numCols + 2) * self.__stride)
+
+		# Neighbourhood of every space, built by shifting its bit
+		stride = self.__stride
+		self.__adjMasks: list[int] = []
+		for i in range(len(self.__numbers)):
+			bit = 1 << i
+			column = bit | bit << 1 | bit >> 1
+			self.__adjMasks.append((column | column << stride | column >> stride) & ~bit)
+
+		# Previous states of spaces changed by setState, used by restore
+		self.__history: list[tuple[int, int, int]] = []
+
+		# Create a set for keeping track of the unknown tiles
+		self.unknownSet: set[tuple[int, int]] = {
+			(c, r) for r in range(numRows) for c in range(numCols)
+		}
+		# Live frontier, kept up to date by updateState
+		self.frontier: FrontierIndex = FrontierIndex(self)
+
+
+	def getNumRows(self) -> int:
+		return self.__numRows
+
+
+	def getNumCols(self) -> int:
+		return self.__numCols
+
+
+	def getTileMask(self, c: int, r: int) -> int:
+		"""Returns the bit of a tile."""
+		return 1 << ((c+1) * self.__stride + r + 1)
+
+
+	def getAdjMask(self, c: int, r: int) -> int:
+		"""Returns a mask of the 8 spaces around a tile."""
+		return self.__adjMasks[(c+1) * self.__stride + r + 1]
+
+
+	def updateState(self, c: int, r: int, percept: int) -> None:
+		"""Update the board information based on the percept from an action."""
+		if c < 0 or r < 0 or c >= self.__numCols or r >= self.__numRows:
+			raise ValueError(f"Coordinates {r},{c} out of bounds")
+		self.unknownSet.discard((c, r))
+		state: int = percept if percept >= 0 else State.FLAG
+		self.__writeState(c, r, state)
+		self.frontier.reveal(c, r, state)
+
+
+	def setState(self, c: int, r: int, state: int) -> None:
+		"""
+		Directly set the state for a grid space. Meant for trial assignments, the
+		previous state is remembered so it can be undone with `restore`.
+		"""
+		if c < 0 or r < 0 or c >= self.__numCols or r >= self.__numRows:
+			raise ValueError(f"Coordinates {r},{c} out of bounds")
+		old: int = self.getState(c, r)
+		if old != state:
+			self.__history.append((c, r, old))
+			self.__writeState(c, r, state)
+
+
+	def checkpoint(self) -> int:
+		"""Returns a marker that `restore` can roll trial assignments back to."""
+		return len(self.__history)
+
+
+	def restore(self, marker: int) -> None:
+		"""Undo every `setState` made since `checkpoint` returned the marker."""
+		history = self.__history
+		while len(history) > marker:
+			c, r, state = history.pop()
+			self.__writeState(c, r, state)
+
+
+	def __writeState(self, c: int, r: int, state: int) -> None:
+		"""Move a tile's bit to the mask matching its new state."""
+		i: int = (c+1) * self.__stride + r + 1
+		bit: int = 1 << i
+		self.unknownMask &= ~bit
+		self.flagMask &= ~bit
+		self.uncoveredMask &= ~bit
+		if state == State.UNKNOWN:
+			self.unknownMask |= bit
+		elif state == State.FLAG:
+			self.flagMask |= bit
+		else:
+			self.uncoveredMask |= bit
+			self.__numbers[i] = state
+
+
+	def getState(self, c: int, r: int) -> int:
+		"""Returns the state of a tile."""
+		i: int = (c+1) * self.__stride + r + 1
+		if self.unknownMask >> i & 1:
+			return State.UNKNOWN
+		if self.flagMask >> i & 1:
+			return State.FLAG
+		if self.uncoveredMask >> i & 1:
+			return self.__numbers[i]
+		return State.BORDER
+
+
+	def __adjList(self, c: int, r: int, mask: int) -> list[tuple[int, int]]:
+		"""Helper function that returns coordinates of all adjacent tiles set in a mask."""
+		adj: int = mask & self.getAdjMask(c, r)
+		return [
+			(c+i-1, r+j-1)
+			for i in range(3)
+			for j in range(3)
+			if (i * j != 1) and adj >> ((c+i) * self.__stride + r + j) & 1
+		]
+
+
+	def getAdjFlaggedList(self, c: int, r: int) -> list[tuple[int, int]]:
+		"""Returns a list containing the coordinates of all adjacent flagged tiles."""
+		return self.__adjList(c, r, self.flagMask)
+
+
+	def getAdjUnknownList(self, c: int, r: int) -> list[tuple[int, int]]:
+		"""Returns a list containing the coordinates of all adjacent unknown tiles."""
+		return self.__adjList(c, r, self.unknownMask)
+
+
+	def getAdjUncoveredList(self, c: int, r: int) -> list[tuple[int, int]]:
+		"""Returns a list containing the coordinates of all adjacent uncovered tiles."""
+		return self.__adjList(c, r, self.uncoveredMask)
+
+
+	def getAdjDangerList(self, c: int, r: int) -> list[tuple[int, int]]:
+		"""
+		Returns a list containing the coordinates of all adjacent uncovered tiles
+		with a number greater than 0.
+		"""
+		return [(x, y) for x, y in self.__adjList(c, r, self.uncoveredMask) if self.getState(x, y) > 0]
+
+
+	def getFrontierDangerList(self) -> list[tuple[int, int]]:
+		"""
+		Returns a list containing the coordinates of all uncovered tiles with a
+		number greater than 0 that are next to at least one unknown tile.
+		"""
+		return list(self.frontier.dangerSet)
+
+
+	def getNumAdjFlagged(self, c: int, r: int) -> int:
+		"""Returns number of adjacent tiles that are flagged."""
+		return popcount(self.flagMask & self.getAdjMask(c, r))
+
+
+	def getNumAdjUnknown(self, c: int, r: int) -> int:
+		"""Returns number of adjacent tiles that are unknown."""
+		return popcount(self.unknownMask & self.getAdjMask(c, r))
+
+
+	def getConstraints(self, tiles: list[tuple[int, int]], assigned: int) -> list[tuple[int, int, int]]:
+		"""
+		Turns numbered tiles into constraints on a set of unknown tiles that are
+		about to be assigned (given as a mask). Returns one (mask, low, high) per
+		tile: a trial mine mask is consistent with the tile when the number of
+		its bits inside `mask` is between low and high.
+		"""
+		constraints: list[tuple[int, int, int]] = []
+		for c, r in tiles:
+			adj: int = self.getAdjMask(c, r)
+			danger: int = self.getState(c, r)
+			flagged: int = popcount(self.flagMask & adj)
+			unknown: int = popcount(self.unknownMask & adj & ~assigned)
+			constraints.append((adj & assigned, danger - flagged - unknown, danger - flagged))
+		return constraints
+
+
+	@staticmethod
+	def isConsistent(constraints: list[tuple[int, int, int]], mines: int) -> bool:
+		"""Checks a trial mine mask against constraints from `getConstraints`."""
+		for mask, low, high in constraints:
+			count: int = popcount(mines & mask)
+			if count < low or count > high:
+				return False
+		return True
+
+
+	def debugGrid(self) -> None:
+		"""
+		(DEBUG) Print AI's knowledge of the entire grid. Uses the same legend as
+		`GameGrid.debugGrid`.
+		"""
+		for i in range(self.__numRows - 1, -1, -1):
+			line: str = f"{str(i).rjust(2)} | "
+			for j in range(self.__numCols):
+				state = self.getState(j, i)
+				if state >= 0:
+					line += str(state) + " "
+				elif state == State.FLAG:
+					line += "X" + " "
+				elif state == State.UNKNOWN:
+					line += "." + " "
+				else:
+					line += "E" + " "
+			print(line)
+		print("AI +" + "--" * self.__numCols)
+		print("GRID" + "".join(f"{str(i).rjust(2)}" for i in range(self.__numCols)))
@@ -0,0 +1,228 @@
+"""
+Packed world corpus format.
+
+A corpus stores many Minesweeper worlds in one file so large benchmark sets do
+not pay for one open() and text parse per world. All integers are little
+endian.
+
+	header		"MSWC" magic, uint8 version
+	records		one after another, each:
+				  uint16 name length, name (utf-8)
+				  uint16 rows, uint16 cols, uint16 startX, uint16 startY
+				  mine bitmap, ceil(rows*cols/8) bytes, bit i is tile
+				  (i // rows, i % rows), the same order as World's buffers
+	index		uint64 offset of every record
+	trailer		uint64 offset of the index, uint32 number of records
+
+The first move is stored 0-indexed. Inside a directory of worlds, corpus
+files are told apart from text world files by their .mswc extension. Run this
+file directly to convert text world files:
+
+	python Corpus.py [InputPath] [OutputFile]
+"""
+
+import mmap
+import os
+import struct
+import sys
+
+MAGIC = b"MSWC"
+VERSION = 1
+EXTENSION = ".mswc"
+
+_HEADER = struct.Struct("<4sB")
+_RECORD = struct.Struct("<HHHH")
+_NAME = struct.Struct("<H")
+_OFFSET = struct.Struct("<Q")
+_TRAILER = struct.Struct("<QI")
+
+# Byte value -> the 8 tiles it covers, one 0/1 byte per tile
+_UNPACK = [bytes((b >> i) & 1 for i in range(8)) for b in range(256)]
+
+
+class WorldRecord:
+	"""
+	One world held in memory: dimensions, 0-indexed first move and a bitmap of
+	mine locations.
+	"""
+	def __init__(self, name: str, rows: int, cols: int, startX: int, startY: int, bitmap: bytes):
+		self.name: str = name
+		self.rows: int = rows
+		self.cols: int = cols
+		self.startX: int = startX
+		self.startY: int = startY
+		self.bitmap: bytes = bitmap
+
+
+	def mines(self) -> bytearray:
+		"""Returns one 0/1 byte per tile, tile (c, r) at index c * rows + r."""
+		return bytearray(b"".join([_UNPACK[b] for b in self.bitmap])[:self.rows * self.cols])
+
+
+	@staticmethod
+	def packMines(mines) -> bytes:
+		"""Packs one truthy value per tile into a mine bitmap."""
+		bitmap = bytearray((len(mines) + 7) // 8)
+		for i, mine in enumerate(mines):
+			if mine:
+				bitmap[i >> 3] |= 1 << (i & 7)
+		return bytes(bitmap)
+
+
+def readWorldFile(filename: str) -> WorldRecord:
+	"""Parses a text world file into a WorldRecord."""
+	with open(filename, 'r') as file:
+		rows, cols = [int(x) for x in file.readline().split()]
+		startX, startY = [int(x) - 1 for x in file.readline().split()]
+		mines = bytearray(rows * cols)
+		for r, line in zip(range(rows - 1, -1, -1), file.readlines()):
+			for c, tile in zip(range(cols), line.split()):
+				if tile == "1":
+					mines[c * rows + r] = 1
+	return WorldRecord(filename, rows, cols, startX, startY, WorldRecord.packMines(mines))
+
+
+def writeCorpus(filename: str, records) -> int:
+	"""Writes an iterable of WorldRecords to a corpus file, returning how many were written."""
+	offsets: list[int] = []
+	with open(filename, 'wb') as file:
+		file.write(_HEADER.pack(MAGIC, VERSION))
+		for record in records:
+			offsets.append(file.tell())
+			name = record.name.encode("utf-8")
+			file.write(_NAME.pack(len(name)))
+			file.write(name)
+			file.write(_RECORD.pack(record.rows, record.cols, record.startX, record.startY))
+			file.write(record.bitmap)
+		indexOffset = file.tell()
+		for offset in offsets:
+			file.write(_OFFSET.pack(offset))
+		file.write(_TRAILER.pack(indexOffset, len(offsets)))
+	return len(offsets)
+
+
+def isCorpusFile(filename: str) -> bool:
+	"""Returns true if the file starts with the corpus magic bytes."""
+	try:
+		with open(filename, 'rb') as file:
+			return file.read(len(MAGIC)) == MAGIC
+	except OSError:
+		return False
+
+
+class Corpus:
+	"""
+	Read-only view of a corpus file. The file is memory mapped and each world is
+	only decoded when it is indexed or reached while iterating.
+	"""
+	__opened: dict[str, "Corpus"] = {}
+
+	def __init__(self, filename: str):
+		self.filename: str = filename
+		with open(filename, 'rb') as file:
+			self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, version = _HEADER.unpack_from(self.__map, 0)
+		if magic != MAGIC or version != VERSION:
+			raise ValueError(f"{filename} is not a version {VERSION} world corpus")
+		self.__indexOffset, self.__count = _TRAILER.unpack_from(self.__map, len(self.__map) - _TRAILER.size)
+
+
+	@classmethod
+	def shared(cls, filename: str) -> "Corpus":
+		"""
+		Returns a corpus that stays open for the rest of the process, mapping each
+		file only once. Used by worker processes that are handed record indices.
+		"""
+		if filename not in cls.__opened:
+			cls.__opened[filename] = cls(filename)
+		return cls.__opened[filename]
+
+
+	def __len__(self) -> int:
+		return self.__count
+
+
+	def __getitem__(self, i: int) -> WorldRecord:
+		if i < 0:
+			i += self.__count
+		if i < 0 or i >= self.__count:
+			raise IndexError("corpus index out of range")
+		data = self.__map
+		offset: int = _OFFSET.unpack_from(data, self.__indexOffset + i * _OFFSET.size)[0]
+		nameLength: int = _NAME.unpack_from(data, offset)[0]
+		offset += _NAME.size
+		name: str = data[offset:offset + nameLength].decode("utf-8")
+		offset += nameLength
+		rows, cols, startX, startY = _RECORD.unpack_from(data, offset)
+		offset += _RECORD.size
+		bitmap: bytes = data[offset:offset + (rows * cols + 7) // 8]
+		return WorldRecord(name, rows, cols, startX, startY, bitmap)
+
+
+	def __iter__(self) -> "generator of WorldRecord":
+		for i in range(self.__count):
+			yield self[i]
+
+
+	def close(self) -> None:
+		self.__map.close()
+
+
+	def __enter__(self) -> "Corpus":
+		return self
+
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+
+def expandWorlds(worlds, lazy: bool = False) -> "generator of str, WorldRecord or (str, int)":
+	"""
+	Yields every world named by `worlds`, which may be a single path, a
+	WorldRecord or an iterable of either. Directories are walked in the same
+	order `Main.py` uses, text world files are yielded as paths and corpus files
+	are expanded into their records. With `lazy`, corpus records are yielded as
+	(corpus path, index) pairs instead, to be read with `Corpus.shared`.
+	"""
+	if isinstance(worlds, (str, WorldRecord)):
+		worlds = [worlds]
+	for world in worlds:
+		if isinstance(world, WorldRecord):
+			yield world
+		elif os.path.isdir(world):
+			for dirpath, _, filenames in os.walk(world):
+				for filename in filenames:
+					path: str = os.path.join(dirpath, filename)
+					# Checked by extension, sniffing would open every text world twice
+					if filename.endswith(EXTENSION):
+						yield from _corpusWorlds(path, lazy)
+					else:
+						yield path
+		elif isCorpusFile(world):
+			yield from _corpusWorlds(world, lazy)
+		else:
+			yield world
+
+
+def _corpusWorlds(filename: str, lazy: bool) -> "generator of WorldRecord or (str, int)":
+	with Corpus(filename) as corpus:
+		if lazy:
+			for i in range(len(corpus)):
+				yield filename, i
+		else:
+			yield from corpus
+
+
+def convert(inputPath: str, outputFile: str) -> int:
+	"""Packs a text world file or a directory of them into a corpus file."""
+	return writeCorpus(outputFile, (
+		world if isinstance(world, WorldRecord) else readWorldFile(world)
+		for world in expandWorlds(inputPath)
+	))
+
+
+if __name__ == "__main__":
+	if len(sys.argv) != 3:
+		print("Usage: python Corpus.py [InputPath] [OutputFile]")
+	else:
+		print("Packed {} worlds into {}".format(convert(sys.argv[1], sys.argv[2]), sys.argv[2]))
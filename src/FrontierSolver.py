@@ -0,0 +1,648 @@
+from math import comb, gcd
+
+# Search nodes enumerated between two checks of the move budget
+BUDGET_INTERVAL = 256
+# Components with at most this many tiles are cheap enough to enumerate even
+# once the move budget has run out
+SMALL_COMPONENT = 12
+
+
+def _convolve(dists: list[dict[int, int]], shift: int = 0) -> dict[int, int]:
+	"""Combines mine count distributions of independent groups of tiles."""
+	total: dict[int, int] = {shift: 1}
+	for dist in dists:
+		combined: dict[int, int] = {}
+		for k1, n1 in total.items():
+			for k2, n2 in dist.items():
+				combined[k1 + k2] = combined.get(k1 + k2, 0) + n1 * n2
+		total = combined
+	return total
+
+
+def _addCounts(counts: dict[int, int], other: dict[int, int]) -> None:
+	for k, n in other.items():
+		counts[k] = counts.get(k, 0) + n
+
+
+class _OutOfBudget(Exception):
+	"""Unwinds an enumeration when the move budget runs out."""
+	def __init__(self, nodes: int):
+		super().__init__(nodes)
+		self.nodes: int = nodes
+
+
+class Component:
+	"""
+	One independent piece of the frontier. Unknown tiles in different components
+	never share a constraint, so each component can be enumerated on its own.
+
+	`counts[k]` is the number of valid assignments that place exactly k mines in
+	the component, and `tileCounts[k][i]` is how many of those assignments put a
+	mine on `tiles[i]`.
+	"""
+	def __init__(self, tiles: list[tuple[int,int]], constraints: list[tuple[int, list[int]]]):
+		self.tiles: list[tuple[int,int]] = tiles
+		self.constraints: list[tuple[int, list[int]]] = constraints
+		self.counts: dict[int, int] = {}
+		self.tileCounts: dict[int, list[int]] = {}
+
+
+	def numSolutions(self) -> int:
+		"""Returns the total number of valid assignments for the component."""
+		return sum(self.counts.values())
+
+
+	def mineCounts(self) -> list[int]:
+		"""Returns, for each tile, the number of valid assignments where it is a mine."""
+		totals: list[int] = [0] * len(self.tiles)
+		for perTile in self.tileCounts.values():
+			for i, n in enumerate(perTile):
+				totals[i] += n
+		return totals
+
+
+class FrontierSolver:
+	"""
+	Solves every constraint on the frontier at once instead of one tile's
+	neighbourhood at a time.
+
+	The frontier is split into connected components (unknown tiles linked through
+	shared numbered tiles) and each component is enumerated once with
+	backtracking. Partial assignments are pruned as soon as any numbered tile
+	has too many or too few mines left to place. Two enumerators are available:
+	"ordered" assigns tiles in the order they were reached, "mrv" always
+	branches on the most constrained numbered tile and forward checks every
+	assignment. Both count solutions per tile, so memory grows with the size
+	of the component and not with its number of solutions.
+
+	Before enumerating, `deduce` can row-reduce each component's constraints as
+	a linear system, which finds most forced tiles in polynomial time.
+
+	Solved components are cached by their constraints, so a component that the
+	last move did not touch is not enumerated or reduced again.
+
+	Both `deduce` and `solve` take an optional move budget (see MyAI.MoveBudget).
+	Elimination is polynomial and always runs, it only counts its row
+	operations against the budget. Once the budget runs out, `solve` still
+	enumerates components of up to SMALL_COMPONENT tiles but skips the larger
+	ones that are not cached, and `lastComplete` tells whether every component
+	was covered.
+	"""
+	def __init__(self, grid: "GameGrid", enumerator: str = "mrv"):
+		self.__grid = grid
+		if enumerator == "ordered":
+			self.__enumerate = self.__enumerateOrdered
+		elif enumerator == "mrv":
+			self.__enumerate = self.__enumerateMRV
+		else:
+			raise ValueError(f"Unknown enumerator {enumerator}")
+		self.__cache: dict[frozenset, Component] = {}
+		self.__deductions: dict[frozenset, tuple[list[tuple[int,int]], list[tuple[int,int]]]] = {}
+		self.lastNodes: int = 0 # Search nodes (or row operations) used by the last call to solve (or deduce)
+		self.lastComplete: bool = True # False if the budget ran out before the last call covered every component
+
+
+	def deduce(self, budget: "MoveBudget" = None) -> tuple[list[tuple[int,int]], list[tuple[int,int]]]:
+		"""
+		Runs Gaussian elimination on the constraints of every component. Returns a
+		tuple of the tiles that are forced safe and the tiles that are forced to be
+		mines. Only finds a subset of what `solve` finds, but never enumerates, so
+		it covers every component even once the budget has run out.
+		"""
+		safeTiles: list[tuple[int,int]] = []
+		mines: list[tuple[int,int]] = []
+		deductions: dict[frozenset, tuple[list[tuple[int,int]], list[tuple[int,int]]]] = {}
+		self.lastNodes = 0
+		self.lastComplete = True
+		for component in self.__buildComponents():
+			key: frozenset = self.__componentKey(component)
+			result = self.__deductions.get(key)
+			if result is None:
+				ops: int = self.lastNodes
+				result = self.__eliminate(component)
+				if budget is not None:
+					budget.spend(self.lastNodes - ops)
+			deductions[key] = result
+			safeTiles.extend(result[0])
+			mines.extend(result[1])
+		# Only keep components that are still on the frontier
+		self.__deductions = deductions
+		return safeTiles, mines
+
+
+	def solve(self, budget: "MoveBudget" = None) -> tuple[list[tuple[int,int]], list[tuple[int,int]], list[Component]]:
+		"""
+		Enumerates the whole frontier. Returns a tuple of the tiles that are safe
+		in every valid assignment, the tiles that are mines in every valid
+		assignment and the solved components. Components left out because the
+		budget ran out are not returned.
+		"""
+		safeTiles: list[tuple[int,int]] = []
+		mines: list[tuple[int,int]] = []
+		components: list[Component] = []
+		cache: dict[frozenset, Component] = {}
+		self.lastNodes = 0
+		self.lastComplete = True
+		for component in self.__buildComponents():
+			key: frozenset = self.__componentKey(component)
+			cached: Component = self.__cache.get(key)
+			if cached is None:
+				limit: "MoveBudget" = budget
+				if len(component.tiles) <= SMALL_COMPONENT:
+					limit = None
+				elif budget is not None and budget.spend():
+					self.lastComplete = False
+					continue
+				try:
+					self.lastNodes += self.__enumerate(component, limit)
+				except _OutOfBudget as e:
+					# Half counted, the component cannot be used or cached
+					self.lastNodes += e.nodes
+					self.lastComplete = False
+					continue
+			else:
+				component = cached
+			cache[key] = component
+			components.append(component)
+		# Only keep components that are still on the frontier
+		self.__cache = cache
+
+		for component in components:
+			total: int = component.numSolutions()
+			if total == 0:
+				continue
+			for tile, n in zip(component.tiles, component.mineCounts()):
+				if n == 0:
+					safeTiles.append(tile)
+				elif n == total:
+					mines.append(tile)
+		return safeTiles, mines, components
+
+
+	def mineProbabilities(self, components: list[Component], minesLeft: int) -> tuple[dict[tuple[int,int], float], float]:
+		"""
+		Returns the exact probability of a mine on every frontier tile along with
+		the probability for any unknown tile that is not on the frontier.
+
+		Each way of splitting the remaining mines between the components is
+		weighted by the number of ways the rest of the mines can be placed on the
+		unconstrained interior tiles.
+		"""
+		numInterior: int = len(self.__grid.frontier.interiorSet)
+		tileWeights, interiorWeight, weight = self.__countWeights(components, minesLeft)
+
+		probabilities: dict[tuple[int,int], float] = {}
+		if weight == 0:
+			# The mine count does not fit the board knowledge, so fall back to
+			# treating every component on its own.
+			for component in components:
+				total: int = component.numSolutions()
+				for tile, n in zip(component.tiles, component.mineCounts()):
+					probabilities[tile] = n / total if total else 1.0
+			interiorProb: float = minesLeft / numInterior if numInterior > 0 else 1.0
+			return probabilities, min(max(interiorProb, 0.0), 1.0)
+
+		for component, weights in zip(components, tileWeights):
+			for tile, w in zip(component.tiles, weights):
+				probabilities[tile] = w / weight
+
+		interiorProb: float = 1.0
+		if numInterior > 0:
+			interiorProb = interiorWeight / (weight * numInterior)
+		return probabilities, interiorProb
+
+
+	def deduceWithCount(self, components: list[Component], minesLeft: int) -> tuple[list[tuple[int,int]], list[tuple[int,int]]]:
+		"""
+		Finds the tiles forced once the number of mines left on the board is taken
+		into account, which rules out every way of splitting the mines between the
+		components and the interior that does not add up. Returns a tuple of the
+		safe tiles and the mines, interior tiles included. Every component must be
+		solved.
+		"""
+		interiorSet: set[tuple[int,int]] = self.__grid.frontier.interiorSet
+		tileWeights, interiorWeight, weight = self.__countWeights(components, minesLeft)
+		safeTiles: list[tuple[int,int]] = []
+		mines: list[tuple[int,int]] = []
+		if weight == 0:
+			return safeTiles, mines
+		for component, weights in zip(components, tileWeights):
+			for tile, w in zip(component.tiles, weights):
+				if w == 0:
+					safeTiles.append(tile)
+				elif w == weight:
+					mines.append(tile)
+		if interiorWeight == 0:
+			safeTiles.extend(interiorSet)
+		elif interiorWeight == weight * len(interiorSet):
+			mines.extend(interiorSet)
+		return safeTiles, mines
+
+
+	def __countWeights(self, components: list[Component], minesLeft: int) -> tuple[list[list[int]], int, int]:
+		"""
+		Weighs every assignment of the components by the number of ways the rest
+		of the mines can be placed on the interior tiles. Returns, for every
+		component, the weight of the assignments with a mine on each of its tiles,
+		the interior mines summed over all weighted assignments and the total
+		weight. The total is 0 when no assignment fits the mine count.
+		"""
+		numInterior: int = len(self.__grid.frontier.interiorSet)
+
+		def interiorWays(frontierMines: int) -> int:
+			rest: int = minesLeft - frontierMines
+			if rest < 0 or rest > numInterior:
+				return 0
+			return comb(numInterior, rest)
+
+		frontierDist: dict[int, int] = _convolve([c.counts for c in components])
+		weight: int = sum(n * interiorWays(k) for k, n in frontierDist.items())
+		if weight == 0:
+			return [], 0, 0
+
+		tileWeights: list[list[int]] = []
+		for j, component in enumerate(components):
+			others: dict[int, int] = _convolve([c.counts for i, c in enumerate(components) if i != j])
+			weights: list[int] = [0] * len(component.tiles)
+			for k, perTile in component.tileCounts.items():
+				ways: int = sum(n * interiorWays(k + k2) for k2, n in others.items())
+				if ways == 0:
+					continue
+				for i, n in enumerate(perTile):
+					weights[i] += n * ways
+			tileWeights.append(weights)
+
+		interiorWeight: int = sum(n * interiorWays(k) * (minesLeft - k) for k, n in frontierDist.items())
+		return tileWeights, interiorWeight, weight
+
+
+	@staticmethod
+	def __componentKey(component: Component) -> frozenset:
+		"""Cache key of a component, its constraints on actual tile positions."""
+		return frozenset(
+			(need, frozenset(component.tiles[i] for i in indices))
+			for need, indices in component.constraints
+		)
+
+
+	def __buildComponents(self) -> list[Component]:
+		"""Splits the frontier into components of tiles that share constraints."""
+		grid = self.__grid
+
+		# Every numbered tile touching an unknown tile is a constraint
+		dangerTiles: list[tuple[int,int]] = grid.getFrontierDangerList()
+
+		tileConstraints: dict[tuple[int,int], list[tuple[int,int]]] = {}
+		constraintTiles: dict[tuple[int,int], list[tuple[int,int]]] = {}
+		for x,y in dangerTiles:
+			unknownTiles = grid.getAdjUnknownList(x,y)
+			constraintTiles[(x,y)] = unknownTiles
+			for tile in unknownTiles:
+				tileConstraints.setdefault(tile, []).append((x,y))
+
+		# Breadth first search over the tile/constraint graph. Tiles are stored in
+		# the order they are reached so neighbouring tiles are assigned together
+		# and constraints are closed off early during enumeration.
+		components: list[Component] = []
+		visited: set[tuple[int,int]] = set()
+		for start in tileConstraints:
+			if start in visited:
+				continue
+			visited.add(start)
+			tiles: list[tuple[int,int]] = []
+			constraints: list[tuple[int,int]] = []
+			seenConstraints: set[tuple[int,int]] = set()
+			queue: list[tuple[int,int]] = [start]
+			for tile in queue:
+				tiles.append(tile)
+				for constraint in tileConstraints[tile]:
+					if constraint in seenConstraints:
+						continue
+					seenConstraints.add(constraint)
+					constraints.append(constraint)
+					for other in constraintTiles[constraint]:
+						if other not in visited:
+							visited.add(other)
+							queue.append(other)
+
+			index: dict[tuple[int,int], int] = {tile: i for i, tile in enumerate(tiles)}
+			components.append(Component(tiles, [
+				(grid.getState(cX,cY) - grid.getNumAdjFlagged(cX,cY), [index[t] for t in constraintTiles[(cX,cY)]])
+				for cX,cY in constraints
+			]))
+		return components
+
+
+	def __enumerateOrdered(self, component: Component, budget: "MoveBudget" = None) -> int:
+		"""
+		Counts every valid assignment of the component with backtracking. Returns
+		the number of search nodes visited. Raises _OutOfBudget if the budget runs
+		out first, the budget is checked every BUDGET_INTERVAL nodes.
+		"""
+		numTiles: int = len(component.tiles)
+		# Mines still needed and tiles still unassigned for every constraint
+		need: list[int] = [mines for mines, _ in component.constraints]
+		left: list[int] = [len(indices) for _, indices in component.constraints]
+		varConstraints: list[list[int]] = [[] for _ in range(numTiles)]
+		for c, (_, indices) in enumerate(component.constraints):
+			for i in indices:
+				varConstraints[i].append(c)
+
+		assignment: list[bool] = [False] * numTiles
+		counts: dict[int, int] = component.counts
+		tileCounts: dict[int, list[int]] = component.tileCounts
+		nodes: list[int] = [0]
+
+		def search(i: int, numMines: int) -> None:
+			nodes[0] += 1
+			if budget is not None and nodes[0] % BUDGET_INTERVAL == 0 and budget.spend(BUDGET_INTERVAL):
+				raise _OutOfBudget(nodes[0])
+			if i == numTiles:
+				counts[numMines] = counts.get(numMines, 0) + 1
+				perTile = tileCounts.get(numMines)
+				if perTile is None:
+					perTile = tileCounts[numMines] = [0] * numTiles
+				for j in range(numTiles):
+					if assignment[j]:
+						perTile[j] += 1
+				return
+
+			constraints = varConstraints[i]
+			# Try the tile as safe
+			valid: bool = True
+			for c in constraints:
+				left[c] -= 1
+				if need[c] > left[c]:
+					valid = False
+			if valid:
+				search(i + 1, numMines)
+			# Try the tile as a mine
+			valid = True
+			for c in constraints:
+				need[c] -= 1
+				if need[c] < 0:
+					valid = False
+			if valid:
+				assignment[i] = True
+				search(i + 1, numMines + 1)
+				assignment[i] = False
+			for c in constraints:
+				need[c] += 1
+				left[c] += 1
+
+		search(0, 0)
+		if budget is not None:
+			budget.spend(nodes[0] % BUDGET_INTERVAL)
+		return nodes[0]
+
+
+	def __enumerateMRV(self, component: Component, budget: "MoveBudget" = None) -> int:
+		"""
+		Counts every valid assignment of the component like `__enumerateOrdered`,
+		without visiting the assignments one by one:
+
+		- it branches on a tile of the open numbered tile with the fewest
+		  unassigned tiles left (most constrained first)
+		- after every assignment it forces the rest of any numbered tile that
+		  became full (all safe) or tight (all mines), so dead ends are found
+		  before branching on them
+		- the tiles still unassigned are then split into groups that no longer
+		  share an open numbered tile, each group is counted on its own and the
+		  counts are combined by convolution
+
+		Each group returns its counts by number of mines and, for each of its
+		tiles, the counts with a mine on it, so memory grows with the component
+		and not with its number of solutions. Returns the number of search nodes
+		visited. Raises _OutOfBudget if the budget runs out first.
+		"""
+		numTiles: int = len(component.tiles)
+		numConstraints: int = len(component.constraints)
+		constraintTiles: list[list[int]] = [indices for _, indices in component.constraints]
+		# Mines still needed and tiles still unassigned for every constraint
+		need: list[int] = [mines for mines, _ in component.constraints]
+		left: list[int] = [len(indices) for indices in constraintTiles]
+		varConstraints: list[list[int]] = [[] for _ in range(numTiles)]
+		for c, indices in enumerate(constraintTiles):
+			for i in indices:
+				varConstraints[i].append(c)
+
+		# None = unassigned, tiles are undone in reverse order from the trail
+		assignment: list[bool] = [None] * numTiles
+		trail: list[int] = []
+		nodes: list[int] = [0]
+
+		def assign(i: int, mine: bool) -> bool:
+			"""Assigns a tile, returns False if a constraint can no longer be met."""
+			assignment[i] = mine
+			trail.append(i)
+			valid: bool = True
+			for c in varConstraints[i]:
+				left[c] -= 1
+				if mine:
+					need[c] -= 1
+				if need[c] < 0 or need[c] > left[c]:
+					valid = False
+			return valid
+
+		def undo(marker: int) -> None:
+			while len(trail) > marker:
+				i: int = trail.pop()
+				for c in varConstraints[i]:
+					left[c] += 1
+					if assignment[i]:
+						need[c] += 1
+				assignment[i] = None
+
+		def propagate(constraints: list[int]) -> bool:
+			"""Forces the open tiles of every constraint that is full or tight."""
+			stack: list[int] = list(constraints)
+			while stack:
+				c: int = stack.pop()
+				if left[c] == 0:
+					continue
+				if need[c] == 0:
+					mine: bool = False
+				elif need[c] == left[c]:
+					mine: bool = True
+				else:
+					continue
+				for j in constraintTiles[c]:
+					if assignment[j] is None:
+						if not assign(j, mine):
+							return False
+						stack.extend(varConstraints[j])
+			return True
+
+		def split(tiles: list[int]) -> list[list[int]]:
+			"""Groups the unassigned tiles that are linked through open constraints."""
+			groups: list[list[int]] = []
+			seen: set[int] = set()
+			for start in tiles:
+				if assignment[start] is not None or start in seen:
+					continue
+				seen.add(start)
+				group: list[int] = [start]
+				for i in group:
+					for c in varConstraints[i]:
+						if left[c]:
+							for j in constraintTiles[c]:
+								if assignment[j] is None and j not in seen:
+									seen.add(j)
+									group.append(j)
+				groups.append(group)
+			return groups
+
+		def combine(assigned: list[int], groups: list[list[int]], counts: dict[int, int], tileCounts: dict[int, dict[int, int]]) -> None:
+			"""
+			Counts each group and adds the solutions of the branch that assigned
+			`assigned` to counts (by number of mines) and tileCounts (by tile, then
+			number of mines).
+			"""
+			branchMines: int = sum(1 for j in assigned if assignment[j])
+			results: list[tuple[dict[int, int], dict[int, dict[int, int]]]] = []
+			for group in groups:
+				result = count(group)
+				if not result[0]:
+					return
+				results.append(result)
+
+			total: dict[int, int] = _convolve([result[0] for result in results], branchMines)
+			_addCounts(counts, total)
+			for j in assigned:
+				if assignment[j]:
+					_addCounts(tileCounts.setdefault(j, {}), total)
+			for g, (_, groupTileCounts) in enumerate(results):
+				others: dict[int, int] = _convolve([result[0] for h, result in enumerate(results) if h != g], branchMines)
+				for j, perMines in groupTileCounts.items():
+					_addCounts(tileCounts.setdefault(j, {}), _convolve([perMines, others]))
+
+		def count(group: list[int]) -> tuple[dict[int, int], dict[int, dict[int, int]]]:
+			"""Counts the solutions of a group of unassigned tiles."""
+			nodes[0] += 1
+			# Far fewer and heavier nodes than the ordered enumerator, check every one
+			if budget is not None and budget.spend(1):
+				raise _OutOfBudget(nodes[0])
+
+			# Most constrained open constraint of the group
+			best: int = -1
+			bestLeft: int = numTiles + 1
+			for i in group:
+				for c in varConstraints[i]:
+					if 0 < left[c] < bestLeft:
+						best, bestLeft = c, left[c]
+			for i in constraintTiles[best]:
+				if assignment[i] is None:
+					break
+
+			counts: dict[int, int] = {}
+			tileCounts: dict[int, dict[int, int]] = {}
+			for mine in (False, True):
+				marker: int = len(trail)
+				if assign(i, mine) and propagate(varConstraints[i]):
+					combine(trail[marker:], split(group), counts, tileCounts)
+				undo(marker)
+			return counts, tileCounts
+
+		# Constraints that are already full or tight force their tiles up front
+		counts: dict[int, int] = {}
+		tileCounts: dict[int, dict[int, int]] = {}
+		if propagate(range(numConstraints)):
+			combine(list(trail), split(range(numTiles)), counts, tileCounts)
+		component.counts.update(counts)
+		for j, perMines in tileCounts.items():
+			for k, n in perMines.items():
+				perTile = component.tileCounts.setdefault(k, [0] * numTiles)
+				perTile[j] = n
+		for k in counts:
+			component.tileCounts.setdefault(k, [0] * numTiles)
+		return nodes[0]
+
+
+	def __eliminate(self, component: Component) -> tuple[list[tuple[int,int]], list[tuple[int,int]]]:
+		"""
+		Row-reduces the component's constraints (one row per numbered tile, a 0/1
+		coefficient per unknown tile) to reduced row echelon form over the
+		integers, then reads forced tiles off the rows.
+
+		Every tile is 0 or 1, so a row can only reach its lowest value (the sum of
+		its negative coefficients) or its highest value (the sum of its positive
+		ones) in a single way. A row whose right hand side equals either bound pins
+		all of its tiles. Pinned tiles are substituted into the other rows until
+		no new tile is pinned.
+		"""
+		# Sparse rows: (tile index -> coefficient, right hand side)
+		reduced: list[tuple[dict[int, int], int]] = []
+		pivots: list[int] = []
+		ops: int = 0
+
+		for need, indices in component.constraints:
+			row: dict[int, int] = dict.fromkeys(indices, 1)
+			rhs: int = need
+			for (pivotRow, pivotRhs), pivot in zip(reduced, pivots):
+				if pivot in row:
+					row, rhs = self.__combine(row, rhs, pivotRow, pivotRhs, pivot)
+					ops += 1
+			if not row:
+				continue # Linearly dependent on earlier rows
+			pivot: int = min(row)
+			if row[pivot] < 0:
+				row = {i: -a for i, a in row.items()}
+				rhs = -rhs
+			# Keep the system fully reduced by clearing the new pivot everywhere
+			for j, (other, otherRhs) in enumerate(reduced):
+				if pivot in other:
+					reduced[j] = self.__combine(other, otherRhs, row, rhs, pivot)
+					ops += 1
+			reduced.append((row, rhs))
+			pivots.append(pivot)
+		self.lastNodes += ops
+
+		known: dict[int, int] = {}
+		rows: list[tuple[dict[int, int], int]] = reduced
+		changed: bool = True
+		while changed:
+			changed = False
+			remaining: list[tuple[dict[int, int], int]] = []
+			for row, rhs in rows:
+				if any(i in known for i in row):
+					rhs -= sum(a * known[i] for i, a in row.items() if i in known)
+					row = {i: a for i, a in row.items() if i not in known}
+				if not row:
+					continue
+				low: int = sum(a for a in row.values() if a < 0)
+				high: int = sum(a for a in row.values() if a > 0)
+				if rhs == low or rhs == high:
+					mineSign: bool = rhs == high # Tiles with this sign are mines
+					for i, a in row.items():
+						known[i] = 1 if (a > 0) == mineSign else 0
+					changed = True
+				else:
+					remaining.append((row, rhs))
+			rows = remaining
+
+		safeTiles: list[tuple[int,int]] = [component.tiles[i] for i, v in known.items() if v == 0]
+		mines: list[tuple[int,int]] = [component.tiles[i] for i, v in known.items() if v == 1]
+		return safeTiles, mines
+
+
+	@staticmethod
+	def __combine(row: dict[int, int], rhs: int, pivotRow: dict[int, int], pivotRhs: int, pivot: int) -> tuple[dict[int, int], int]:
+		"""
+		Eliminates the pivot tile from a row using the pivot row, scaling both so
+		the result stays integral, and divides out the common factor.
+		"""
+		a: int = row[pivot]
+		p: int = pivotRow[pivot]
+		result: dict[int, int] = {i: v * p for i, v in row.items()}
+		for i, v in pivotRow.items():
+			value: int = result.get(i, 0) - a * v
+			if value:
+				result[i] = value
+			else:
+				result.pop(i, None)
+		rhs = rhs * p - a * pivotRhs
+		divisor: int = gcd(rhs, *result.values())
+		if divisor > 1:
+			result = {i: v // divisor for i, v in result.items()}
+			rhs //= divisor
+		return result, rhs
@@ -0,0 +1,65 @@
+import random
+
+from Corpus import WorldRecord
+
+
+class WorldGenerator:
+	"""
+	Seeded random world generator for boards of any size and mine count.
+
+	The first move is chosen before the mines are placed and its 3x3
+	neighbourhood is kept clear, so every board starts on a "0" tile without
+	any retry loops. Mines are drawn with `random.sample` over the remaining
+	tiles, so placing them costs O(mines) regardless of the board size.
+
+	World `i` only depends on the seed and `i`, so a stream of boards can be
+	split between processes and still be reproduced exactly.
+	"""
+	def __init__(self, rows: int, cols: int, mines: int, seed: int = 0):
+		self.__rows: int = rows
+		self.__cols: int = cols
+		self.__mines: int = mines
+		self.__seed: int = seed
+		# The first move keeps at most 9 tiles free of mines
+		if rows < 1 or cols < 1 or mines < 0 or mines > rows * cols - min(rows, 3) * min(cols, 3):
+			raise ValueError(f"Cannot place {mines} mines on a {rows}x{cols} board with a safe opening")
+
+
+	def generate(self, index: int = 0) -> WorldRecord:
+		"""Returns world number `index` of this generator's sequence."""
+		rows, cols = self.__rows, self.__cols
+		rng = random.Random(f"{self.__seed}:{index}")
+
+		startX: int = rng.randrange(cols)
+		startY: int = rng.randrange(rows)
+		# Tiles around the first move, in index order (tile (c, r) is c * rows + r)
+		opening: list[int] = [
+			c * rows + r
+			for c in range(max(startX - 1, 0), min(startX + 2, cols))
+			for r in range(max(startY - 1, 0), min(startY + 2, rows))
+		]
+
+		# Sample from the tiles outside the opening, then shift each sample past
+		# the opening tiles that come before it
+		bitmap = bytearray((rows * cols + 7) // 8)
+		for i in rng.sample(range(rows * cols - len(opening)), self.__mines):
+			for skipped in opening:
+				if skipped <= i:
+					i += 1
+			bitmap[i >> 3] |= 1 << (i & 7)
+
+		name: str = f"random-{rows}x{cols}-{self.__mines}-seed{self.__seed}-{index}"
+		return WorldRecord(name, rows, cols, startX, startY, bytes(bitmap))
+
+
+	def stream(self, count: int = None, start: int = 0) -> "generator of WorldRecord":
+		"""Yields `count` consecutive worlds starting at `start`, or never stops if count is None."""
+		index: int = start
+		while count is None or index < start + count:
+			yield self.generate(index)
+			index += 1
+
+
+def generateWorlds(rows: int, cols: int, mines: int, count: int, seed: int = 0) -> "generator of WorldRecord":
+	"""Shorthand for streaming `count` worlds from a new WorldGenerator."""
+	return WorldGenerator(rows, cols, mines, seed).stream(count)
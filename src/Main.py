@@ -17,9 +17,12 @@
 #					Options:
 #						-m Use ManualAI instead of MyAI.
 #						-r Use RandomAI instead of MyAI.
+#						--agent [NAME] Use the agent registered under NAME
+#						   in Agents.py (myai, manual, random, old, personal).
 #						-f [InputPath] [OutputFile]
-#						   First is absolute path to Minesweeper World file or 
-#						   directory containing Minesweeper World files.
+#						   First is absolute path to Minesweeper World file,
+#						   directory containing Minesweeper World files or a
+#						   packed world corpus (see Corpus.py).
 #						   Second is the file name of the .txt file you wish
 #						   to write your results to.
 #						-v Verbose mode displays the name of the Minesweeper
@@ -27,6 +30,13 @@
 #						-d Debug mode will display the game board after
 #						   every move. Useless when used with -m.
 #						-o Path to output file which results are written to.
+#						-j [N] Number of worker processes used to run a
+#						   directory of world files in parallel.
+#						-p Profile mode prints p50/p95/p99 move latency per
+#						   board size and solver path after the run.
+#						-z Flood fill mode uncovers the whole region around
+#						   a "0" tile in one move. Needs an agent with a
+#						   batch getActions method (MyAI).
 #						-h Displays help menu and quits.
 #
 #				- The default AI type is MyAI.
@@ -36,7 +46,11 @@
 #				  [OutputPath] is useless.
 #
 #				- If both -m and -r are turned on, -r will be turned off.
+#				  --agent overrides both.
 #				- -v used without -f is useless.
+#				- -j used without a directory for -f is useless. Debug
+#				  mode always runs serially. Output of parallel runs is
+#				  printed in the same order as a serial run.
 #
 #				- DO NOT MAKE CHANGES TO THIS FILE.
 # ==============================CS-199==================================
@@ -44,10 +58,35 @@
 import sys
 import os
 import argparse
+import io
+from contextlib import redirect_stdout
+from multiprocessing import Pool
 from World import World
-from ManualAI import ManualAI
-from RandomAI import RandomAI
-from MyAI import MyAI
+from Corpus import Corpus, WorldRecord, expandWorlds, isCorpusFile
+from MoveProfiler import MoveProfiler
+from Agents import AGENTS, getAgent
+
+
+def runWorld(args: tuple) -> tuple:
+	""" Build and run a single world, returning its score, move profile and captured output """
+	""" Worker processes capture what the world prints so the parent can print it in world order """
+	source, aiType, verbose, debug, profile, floodFill, capture = args
+	if capture:
+		output = io.StringIO()
+		with redirect_stdout(output):
+			score, profiler, _ = runWorld((source, aiType, verbose, debug, profile, floodFill, False))
+		return score, profiler, output.getvalue()
+	profiler = MoveProfiler() if profile else None
+	if isinstance(source, tuple):
+		# Corpus records are passed as (path, index) and only decoded here
+		path, index = source
+		source = Corpus.shared(path)[index]
+	if isinstance(source, WorldRecord):
+		world = World(record=source, aiType=aiType, verbose=verbose, debug=debug, profiler=profiler, floodFill=floodFill)
+	else:
+		world = World(filename=source, aiType=aiType, verbose=verbose, debug=debug, profiler=profiler, floodFill=floodFill)
+	score = world.run()
+	return score, profiler, None
 
 
 def main():
@@ -59,8 +98,12 @@ def main():
 	parser.add_argument("-f", "-F", help="file or directory name", nargs='*')								# File path
 	parser.add_argument("-m", "-M", help="enable ManualAI mode", action="store_true")			# ManualAI
 	parser.add_argument("-r", "-R", help="enable RandomAI mode", action="store_true")			# RandomAI
+	parser.add_argument("--agent", help="agent to run: " + ", ".join(AGENTS))					# Agent by name
 	parser.add_argument("-v", "-V", help="enable verbose mode", action="store_true")			# Verbose
 	parser.add_argument("-d", "-D", help="enable debug mode", action="store_true")				# Debug
+	parser.add_argument("-j", "-J", help="number of worker processes", type=int, default=1)	# Workers
+	parser.add_argument("-p", "-P", help="enable move latency profiling", action="store_true")	# Profile
+	parser.add_argument("-z", "-Z", help="flood fill zero regions", action="store_true")		# Flood fill
 
 	args = parser.parse_args()
 	
@@ -78,51 +121,75 @@ def main():
 			return
 	verbose = args.v
 	debug = args.d
-
-	if args.m:
+	profile = args.p
+	floodFill = args.z
+	numWorkers = args.j
+	if numWorkers < 1:
+		print("ERROR: -j takes a positive number of workers!")
+		return
+
+	if args.agent:
+		aiType = args.agent
+	elif args.m:
 		aiType = "manual"
 	elif args.r:
 		aiType = "random"
 	elif not args.m and not args.r:
 		aiType = "myai"
+	try:
+		agent = getAgent(aiType)
+	except ValueError as e:
+		print("ERROR: " + str(e))
+		return
+	if floodFill and not hasattr(agent.load(), "getActions"):
+		print("ERROR: -z needs an agent that takes moves in batches (MyAI)!")
+		return
 
 	if inputFile:
-		# If inputFile is a directory
-		if (os.path.isdir(inputFile)):
-			listOfWorlds = None
-
-			try:
-				directory = os.walk(inputFile)
-			except:
-				print("ERROR: Failed to open directory")
-				return
-
+		# If inputFile is a directory or a packed corpus of worlds
+		if (os.path.isdir(inputFile) or isCorpusFile(inputFile)):
 			numScores = 0
 			sumScores = 0
 
 			scoreBeg = 0
 			scoreInt = 0
 			scoreExp = 0
-			for dirpath, _, filenames in directory:
-				for filename in filenames:
-					f = os.path.join(dirpath, filename)
-
-					world = World(filename=f, aiType=aiType, verbose=verbose, debug=debug)
-
-					score = world.run()
-					if score == 1:
-						scoreBeg += 1
-					elif score == 2:
-						scoreInt += 1
-					elif score == 3:
-						scoreExp += 1
-
-					numScores += 1
-					sumScores += score
+			# Collect worlds in walk order so results merge the same way every run.
+			# Corpus records are only referenced here, each run decodes its own.
+			parallel = numWorkers > 1 and not debug and not agent.interactive
+			try:
+				worldArgs = [(world, aiType, verbose, debug, profile, floodFill, parallel) for world in expandWorlds(inputFile, lazy=True)]
+			except (OSError, ValueError):
+				print("ERROR: Failed to read worlds")
+				return
+
+			if parallel:
+				with Pool(numWorkers) as pool:
+					scores = pool.map(runWorld, worldArgs, chunksize=max(1, len(worldArgs) // (numWorkers * 4)))
+			else:
+				scores = map(runWorld, worldArgs)
+
+			profiler = MoveProfiler()
+			for score, worldProfile, output in scores:
+				if output:
+					print(output, end="")
+				if worldProfile:
+					profiler.merge(worldProfile)
+				if score == 1:
+					scoreBeg += 1
+				elif score == 2:
+					scoreInt += 1
+				elif score == 3:
+					scoreExp += 1
+
+				numScores += 1
+				sumScores += score
 					
 			print("---------------Your agent's results:---------------")
 			print("Beginner: {} \tIntermediate: {} \tExpert: {}".format(scoreBeg, scoreInt, scoreExp))
 			print("Cumulative Score: " + str(sumScores))
+			if profile:
+				print(profiler.report())
 
 			if outputFile:
 				currDirectory = os.path.dirname(__file__)
@@ -139,25 +206,31 @@ def main():
 
 		# If inputFile is a world file
 		elif (os.path.isfile(inputFile)):
-			world = World(filename=inputFile, aiType=aiType, verbose=verbose, debug=debug)
+			profiler = MoveProfiler() if profile else None
+			world = World(filename=inputFile, aiType=aiType, verbose=verbose, debug=debug, profiler=profiler, floodFill=floodFill)
 			score = world.run()
 			if score > 0:
 			    print("WORLD COMPLETE")
 			else:
 			    print("WORLD INCOMPLETE")
+			if profile:
+				print(profiler.report())
 
 		# If inputFileis an invalid path
 		else:
 			print("ERROR: Directory or file does not exist!")
 
 	else:
-		world = World(aiType=aiType, verbose=verbose, debug=debug)
+		profiler = MoveProfiler() if profile else None
+		world = World(aiType=aiType, verbose=verbose, debug=debug, profiler=profiler, floodFill=floodFill)
 		score = world.run()
 		print("Your AI scored: " + str(score))
 		if score == 0:
 			print("WORLD INCOMPLETE")
 		else:
 			print("WORLD COMPLETE")
+		if profile:
+			print(profiler.report())
 		
 
 if __name__ == "__main__":
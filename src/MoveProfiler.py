@@ -0,0 +1,72 @@
+class MoveProfiler:
+	"""
+	Opt-in collector for per-move agent latency.
+
+	World records one sample per move when a profiler is passed in: wall time,
+	the solver path the agent reports through `getMoveInfo` (if it has one) and
+	the size of the enumeration the move needed. A getActions batch is split
+	evenly over its moves, the first one taking the reported path and the rest
+	counted as queued. Samples are grouped by board size so percentiles can be
+	reported per difficulty.
+	"""
+	def __init__(self):
+		# (rows, cols) -> list of (seconds, path name, enumeration size)
+		self.samples: dict[tuple[int, int], list[tuple[float, str, int]]] = {}
+		# Run-wide event counts, e.g. pattern cache hits
+		self.counters: dict[str, int] = {}
+
+
+	def record(self, size: tuple[int, int], seconds: float, path: str, work: int) -> None:
+		"""Store one move's sample."""
+		samples = self.samples.get(size)
+		if samples is None:
+			samples = self.samples[size] = []
+		samples.append((seconds, path, work))
+
+
+	def count(self, name: str, n: int = 1) -> None:
+		"""Add to a run-wide counter."""
+		self.counters[name] = self.counters.get(name, 0) + n
+
+
+	def merge(self, other: "MoveProfiler") -> None:
+		"""Add every sample from another profiler, e.g. one returned by a worker process."""
+		for size, samples in other.samples.items():
+			self.samples.setdefault(size, []).extend(samples)
+		for name, n in other.counters.items():
+			self.count(name, n)
+
+
+	@staticmethod
+	def percentile(sortedValues: list[float], p: float) -> float:
+		"""Nearest-rank percentile of an already sorted list."""
+		if not sortedValues:
+			return 0.0
+		rank: int = max(int(-(-p * len(sortedValues) // 100)), 1)
+		return sortedValues[rank - 1]
+
+
+	def report(self) -> str:
+		"""Returns a table of p50/p95/p99/max latency per board size and solver path."""
+		lines: list[str] = ["---------------Move latency (ms):---------------"]
+		for rows, cols in sorted(self.samples):
+			samples = self.samples[(rows, cols)]
+			lines.append(self.__formatLine(f"{rows}x{cols}", samples))
+			byPath: dict[str, list[tuple[float, str, int]]] = {}
+			for sample in samples:
+				byPath.setdefault(sample[1], []).append(sample)
+			for path in sorted(byPath):
+				lines.append(self.__formatLine("    " + path, byPath[path]))
+		for name in sorted(self.counters):
+			lines.append("{:<18} {}".format(name + ":", self.counters[name]))
+		return "\n".join(lines)
+
+
+	def __formatLine(self, label: str, samples: list[tuple[float, str, int]]) -> str:
+		times: list[float] = sorted(s[0] * 1000 for s in samples)
+		work: list[float] = sorted(s[2] for s in samples)
+		return "{:<18} moves: {:<8} p50: {:<8.3f} p95: {:<8.3f} p99: {:<8.3f} max: {:<9.3f} work p99: {}".format(
+			label, len(times),
+			self.percentile(times, 50), self.percentile(times, 95), self.percentile(times, 99), times[-1],
+			self.percentile(work, 99)
+		)
@@ -1,9 +1,12 @@
 from AI import AI
 from Action import Action
+from FrontierSolver import FrontierSolver
+from PairwiseRules import PairwiseRules
 
 from enum import Enum
 from enum import IntEnum
 from itertools import combinations
+from time import perf_counter
 
 
 class State(IntEnum):
@@ -24,49 +27,229 @@ class SearchType(Enum):
 	ONE_SAFE = 0
 	ONE_FLAG = 1
 
+class SolverPath(IntEnum):
+	"""
+	Most expensive stage a move needed, in increasing cost order. QUEUED means
+	the move was already known before the call and no search ran.
+	"""
+	QUEUED = 0
+	TRIVIAL = 1
+	PAIRWISE = 2
+	ONE_SAFE = 3
+	ONE_FLAG = 4
+	SEMI_SHALLOW = 5
+	LINEAR = 6
+	FRONTIER = 7
+	ENDGAME = 8
+	GUESS = 9
+
+
+# LEAVE carries no coordinates, so every game can share one action object
+LEAVE_ACTION = Action(AI.Action.LEAVE)
+
+# Unknown tiles left on the board when the endgame stage starts counting mines
+ENDGAME_UNKNOWNS = 64
+
+
+class MoveBudget:
+	"""
+	Wall time and search nodes one move may use. Search stages report their
+	work with `spend`, which returns True once either limit has been reached.
+	A limit of None is never reached.
+	"""
+	def __init__(self, seconds: float = None, nodes: int = None):
+		self.seconds: float = seconds
+		self.nodes: int = nodes
+		self.used: int = 0 # Nodes spent on the current move
+		self.exhausted: bool = False
+		self.__deadline: float = None
+
+
+	def start(self) -> None:
+		"""Resets the budget at the start of a move."""
+		self.used = 0
+		self.exhausted = False
+		self.__deadline = perf_counter() + self.seconds if self.seconds is not None else None
+
+
+	def spend(self, nodes: int = 0) -> bool:
+		"""Adds work done and returns whether the budget has run out."""
+		self.used += nodes
+		if not self.exhausted:
+			self.exhausted = (
+				(self.nodes is not None and self.used >= self.nodes)
+				or (self.__deadline is not None and perf_counter() >= self.__deadline)
+			)
+		return self.exhausted
+
 
 class MyAI( AI ):
-	def __init__(self, rowDimension, colDimension, totalMines, startX, startY):
+	def __init__(self, rowDimension, colDimension, totalMines, startX, startY, useFrontierSolver: bool = True, gridType: str = "list", patternCache: "PatternCache" = None, timeBudget: float = None, nodeBudget: int = None, enumerator: str = "mrv"):
 		self.__uncoveredLeft: int = rowDimension * colDimension - totalMines - 1
 		self.__totalMines: int = totalMines
+		self.__minesLeft: int = totalMines # Mines that have not been flagged yet
 
 		self.__lastX: int = startX
 		self.__lastY: int = startY
-
-		self.__grid: GameGrid = GameGrid(colDimension, rowDimension)
-		baseProb: float = totalMines / (rowDimension * colDimension)
-		self.__pscores: list[list] = [[baseProb for _ in range(rowDimension)] for _ in range(colDimension)] #PLACEHOLDER VALUE
+		# Moves returned by the last getActions call, in order
+		self.__lastMoves: list[tuple[int,int]] = [(startX, startY)]
+
+		# Board knowledge backend: "list" (GameGrid), "numpy" (NumpyGameGrid,
+		# answers frontier queries with array masks) or "bitboard" (BitboardGameGrid)
+		if gridType == "list":
+			self.__grid: GameGrid = GameGrid(colDimension, rowDimension)
+		elif gridType == "numpy":
+			from NumpyGameGrid import NumpyGameGrid
+			self.__grid: GameGrid = NumpyGameGrid(colDimension, rowDimension)
+		elif gridType == "bitboard":
+			from BitboardGameGrid import BitboardGameGrid
+			self.__grid: GameGrid = BitboardGameGrid(colDimension, rowDimension)
+		else:
+			raise ValueError(f"Unknown grid type {gridType}")
+		# Bitboards check trial configurations with masks instead of setState
+		self.__bitboard: bool = gridType == "bitboard"
 
 		self.__safeSet: set = set()    # Tiles we know are safe (need to uncover)
 		self.__toFlagSet: set = set()  # Tiles we know have mines (need to flag)
 		self.__searchSet: set = set()  # Set of tiles to search
 
+		# Solve the whole frontier at once instead of searching each tile's neighbourhood,
+		# enumerating components with the "ordered" or "mrv" engine (see FrontierSolver)
+		self.__useFrontierSolver: bool = useFrontierSolver
+		self.__solver: FrontierSolver = FrontierSolver(self.__grid, enumerator)
+		self.__pairRules: PairwiseRules = PairwiseRules(self.__grid)
+
+		# Semi-shallow search results by neighbourhood pattern, shared with every
+		# other agent in the process unless a cache is passed in. The shared cache
+		# falls back on the precomputed table, memory mapped once per process.
+		# Only the legacy search path uses them: the frontier solver caches its
+		# components itself and every table result is one it finds anyway, so
+		# looking patterns up first only adds time.
+		self.__patternCache = patternCache
+		if patternCache is None and not useFrontierSolver:
+			from PatternCache import PatternCache
+			from PatternTable import PatternTable
+			self.__patternCache = PatternCache.shared()
+			if self.__patternCache.table is None:
+				self.__patternCache.table = PatternTable.load()
+		# This agent's own lookups, the cache's counters cover every agent sharing it
+		self.__patternHits: int = 0
+		self.__patternMisses: int = 0
+
+		# Solver path and enumeration size of the last move (see getMoveInfo)
+		self.__movePath: SolverPath = SolverPath.QUEUED
+		self.__moveWork: int = 0
+
+		# Optional per-move limit on seconds and search nodes. Once it runs out the
+		# move stops enumerating, the cheap rules and elimination still run, and
+		# guesses with what it has found so far.
+		self.__budget: MoveBudget = None
+		if timeBudget is not None or nodeBudget is not None:
+			self.__budget = MoveBudget(timeBudget, nodeBudget)
+
 	
 	def getAction(self, number: int) -> "Action Object": # type: ignore
-		percept: int = number
-		lastX: int = self.__lastX
-		lastY: int = self.__lastY
+		self.__moveWork = 0
+		if self.__uncoveredLeft == 0:
+			self.__movePath = SolverPath.QUEUED
+			return LEAVE_ACTION
+
+		self.__updateGrid(self.__lastX, self.__lastY, number)
+		self.__updateSets(self.__lastX, self.__lastY, number)
+		if self.__budget is not None:
+			self.__budget.start()
+		self.__search()
+		return self.__nextAction()
+
+
+	def getActions(self, numbers: list[int], revealed: list[tuple[int,int,int]] = None) -> list["Action Object"]:
+		"""
+		Batch version of getAction. Takes the percepts of every action returned by
+		the last call, in order, and returns every move that is currently known to
+		be safe or a mine (or a single guess when there are none). When the world
+		flood fills zero regions, `revealed` holds the (x, y, number) of every
+		tile it uncovered on its own.
+		"""
+		observed: list[tuple[int,int,int]] = [(x, y, number) for (x,y), number in zip(self.__lastMoves, numbers)]
+		if revealed:
+			# A flood fill can reach a tile before the batch's own move on it does,
+			# that tile was already counted when the move was made
+			moved: set[tuple[int,int]] = set(self.__lastMoves)
+			for x, y, number in revealed:
+				if (x,y) not in moved:
+					self.__uncoveredLeft -= 1
+					self.__safeSet.discard((x,y))
+					observed.append((x, y, number))
+
+		self.__moveWork = 0
+		if self.__uncoveredLeft == 0:
+			self.__movePath = SolverPath.QUEUED
+			return [LEAVE_ACTION]
+
+		# Write every percept to the grid before expanding any of them, so a 0 tile
+		# does not queue a neighbour that the same batch already uncovered
+		for x, y, number in observed:
+			self.__updateGrid(x, y, number)
+		for x, y, number in observed:
+			self.__updateSets(x, y, number)
+		if self.__budget is not None:
+			self.__budget.start()
+		self.__search()
+
+		actions: list[Action] = []
+		lastMoves: list[tuple[int,int]] = self.__lastMoves
+		lastMoves.clear()
+		while (self.__safeSet or self.__toFlagSet) and self.__uncoveredLeft > 0:
+			actions.append(self.__nextAction())
+			lastMoves.append((self.__lastX, self.__lastY))
+		return actions
+
+
+	def __updateGrid(self, x: int, y: int, percept: int) -> None:
+		"""Write the percept of a move to the grid."""
+		self.__grid.updateState(x, y, percept)
+		self.__pairRules.update(x, y)
+
+
+	def __updateSets(self, x: int, y: int, percept: int) -> None:
+		"""Queue the tiles a move's percept gives new information about."""
 		grid: GameGrid = self.__grid
+		adjDanger: list[tuple[int,int]] = grid.getAdjDangerList(x, y)
+		# Only the constraints around the changed tile need updating in the pairwise index
+		for cX,cY in adjDanger:
+			self.__pairRules.update(cX, cY)
+		if percept >= 0:
+			if percept == 0:
+				self.__safeSet.update(grid.getAdjUnknownList(x, y))
+			else:
+				self.__searchSet.add((x, y))
+			self.__searchSet.update(adjDanger)
+
 
+	def __search(self) -> None:
+		"""
+		Runs the search stages, cheapest first, until one of them adds a tile to
+		the safe or flag set. Guesses if none of them can. With a move budget,
+		tiles left unsearched when it runs out are kept for the next move.
+		"""
+		grid: GameGrid = self.__grid
 		safeSet: set = self.__safeSet
 		toFlagSet: set = self.__toFlagSet
 		searchSet: set = self.__searchSet
+		pairRules: PairwiseRules = self.__pairRules
+		budget: MoveBudget = self.__budget
+		path: SolverPath = SolverPath.QUEUED
+		deferred: list[tuple[int,int]] = []
 
-		if self.__uncoveredLeft == 0:
-			return Action(AI.Action.LEAVE)
-		
-		grid.updateState(lastX, lastY, percept)
+		# Every mine left is already known, so every other unknown tile is safe
+		if self.__minesLeft == len(toFlagSet) and len(grid.unknownSet) > len(toFlagSet) + len(safeSet):
+			path = SolverPath.TRIVIAL
+			safeSet.update(grid.unknownSet - toFlagSet)
 
-		# Update sets
-		if percept >= 0:
-			if percept == 0:
-				safeSet.update(grid.getAdjUnknownList(lastX, lastY))
-			else:
-				searchSet.add((lastX, lastY))
-			searchSet.update(grid.getAdjDangerList(lastX, lastY))
-		
-		# OPTIMIZATION: (If all mines found, add all unknown tiles to safe set)
 		# Search
+		pending: list[tuple[int,int]] = []
+		if searchSet:
+			path = SolverPath.TRIVIAL
 		while searchSet:
 			x,y = searchSet.pop()
 			danger = grid.getState(x,y)
@@ -75,70 +258,184 @@ class MyAI( AI ):
 
 			if danger == numAdjFlagged:
 				safeSet.update(grid.getAdjUnknownList(x,y))
+				continue
 			elif danger == numAdjFlagged + numAdjUnknown:
 				toFlagSet.update(grid.getAdjUnknownList(x,y))
-			elif danger == numAdjFlagged + numAdjUnknown - 1:
+				continue
+			elif self.__useFrontierSolver:
+				pending.append((x,y)) # Left for the pairwise rules and the frontier solver
+				continue
+
+			path = max(path, SolverPath.PAIRWISE)
+			safeTiles, mines = pairRules.apply(x,y)
+			safeSet.update(safeTiles)
+			toFlagSet.update(mines)
+			if safeTiles or mines:
+				continue
+
+			if danger == numAdjFlagged + numAdjUnknown - 1:
+				path = max(path, SolverPath.ONE_SAFE)
 				safeTiles, mines = self.__shallowSearch(x,y,SearchType.ONE_SAFE)
 				safeSet.update(safeTiles)
 				toFlagSet.update(mines)
 			elif danger == numAdjFlagged + 1:
+				path = max(path, SolverPath.ONE_FLAG)
 				safeTiles, mines = self.__shallowSearch(x,y,SearchType.ONE_FLAG)
 				safeSet.update(safeTiles)
 				toFlagSet.update(mines)
+			elif budget is not None and budget.spend():
+				deferred.append((x,y)) # Only the semi-shallow search enumerates
 			else:
-				safeTiles, mines = self.__semiShallowSearch(x,y)
+				path = max(path, SolverPath.SEMI_SHALLOW)
+				hits: int = self.__patternCache.hits
+				result = self.__patternCache.cached(grid, x, y, self.__semiShallowSearch)
+				if self.__patternCache.hits > hits:
+					self.__patternHits += 1
+				else:
+					self.__patternMisses += 1
+				if result is None:
+					deferred.append((x,y)) # Budget ran out during the search
+					continue
+				safeSet.update(result[0])
+				toFlagSet.update(result[1])
+		searchSet.update(deferred)
+
+		# Pairwise rules on the tiles the trivial rules could not settle
+		if not (safeSet or toFlagSet) and pending:
+			path = SolverPath.PAIRWISE
+			for x,y in pending:
+				safeTiles, mines = pairRules.apply(x,y)
+				safeSet.update(safeTiles)
+				toFlagSet.update(mines)
+				if safeTiles or mines:
+					break
+
+		# Frontier-wide deductions, cheapest first
+		components = None
+		if not (safeSet or toFlagSet) and self.__useFrontierSolver:
+			path = SolverPath.LINEAR
+			safeTiles, mines = self.__solver.deduce(budget)
+			self.__moveWork += self.__solver.lastNodes
+			safeSet.update(safeTiles)
+			toFlagSet.update(mines)
+		if not (safeSet or toFlagSet) and self.__useFrontierSolver:
+			path = SolverPath.FRONTIER
+			safeTiles, mines, components = self.__solver.solve(budget)
+			self.__moveWork += self.__solver.lastNodes
+			safeSet.update(safeTiles)
+			toFlagSet.update(mines)
+
+		# Endgame: few enough unknown tiles are left that the number of mines left
+		# rules out some of the ways to split them between the components and the
+		# interior
+		if not (safeSet or toFlagSet) and len(grid.unknownSet) <= ENDGAME_UNKNOWNS:
+			if components is None:
+				_, _, components = self.__solver.solve(budget)
+				self.__moveWork += self.__solver.lastNodes
+			if self.__solver.lastComplete:
+				path = SolverPath.ENDGAME
+				safeTiles, mines = self.__solver.deduceWithCount(components, self.__minesLeft)
 				safeSet.update(safeTiles)
 				toFlagSet.update(mines)
 		
 		# Guessing/probability heuristics
 		if not (safeSet or toFlagSet):
-			safeSet.add(self.__guessSafeTile())
+			path = SolverPath.GUESS
+			safeSet.add(self.__guessSafeTile(components))
+		self.__movePath = path
+
 
-		# Make move from safe set
-		if safeSet:
-			x,y = safeSet.pop()
+	def __nextAction(self) -> "Action Object":
+		"""Takes the next move from the safe set, or the flag set once it is empty."""
+		if self.__safeSet:
+			x,y = self.__safeSet.pop()
 			self.__uncoveredLeft -= 1
 			self.__updateLastPos(x,y)
 			return Action(AI.Action.UNCOVER, x, y)
-		
-		# Make move from flag set
-		x,y = toFlagSet.pop()
+
+		x,y = self.__toFlagSet.pop()
+		self.__minesLeft -= 1
 		self.__updateLastPos(x,y)
-		searchSet.update(grid.getAdjDangerList(x,y))
+		self.__searchSet.update(self.__grid.getAdjDangerList(x,y))
 		return Action(AI.Action.FLAG, x, y)
-	
+
+
+	def getMoveInfo(self) -> tuple[SolverPath, int]:
+		"""
+		Returns the solver path the last move took and the size of the enumeration
+		it needed (configurations or search nodes tried).
+		"""
+		return self.__movePath, self.__moveWork
+
+
+	def getCounters(self) -> dict[str, int]:
+		"""Returns event counts for the game so far, the pattern cache lookups if it uses the cache."""
+		if self.__patternCache is None:
+			return {}
+		return {"pattern hits": self.__patternHits, "pattern misses": self.__patternMisses}
+
+
+	def wasBudgetHit(self) -> bool:
+		"""Returns whether the last move ran out of its time or node budget."""
+		return self.__budget is not None and self.__budget.exhausted
+
 
 	def __updateLastPos(self, x: int, y: int):
 		"""Update last position for updating board info on next turn."""
 		self.__lastX, self.__lastY = x, y
 
 
-	def __guessSafeTile(self) -> tuple[int, int]:
-		"""Probability heuristic (Edward)"""
+	def __guessSafeTile(self, components: list = None) -> tuple[int, int]:
+		"""
+		Returns the unknown tile with the lowest exact mine probability. Frontier
+		components from this turn's solve can be passed in to avoid solving again.
+		If the move budget left part of the frontier unsolved, the probabilities
+		are estimated instead.
+		"""
 		grid: GameGrid = self.__grid
-		# Recalculate/update pScores
-		for x in range(grid.getNumCols()):
-			for y in range(grid.getNumRows()):
-				danger = grid.getState(x,y)
-				numAdjUnknown = grid.getNumAdjUnknown(x,y)
-				numAdjMines = grid.getNumAdjFlagged(x,y)
-				if danger > 0 and numAdjUnknown != 0:
-					prob = (danger - numAdjMines) / numAdjUnknown
-					for x,y in grid.unknownSet:
-						if prob == 0 or self.__pscores[x][y] < prob:
-							self.__pscores[x][y] = prob
-		min_value: float = 1.0
+		if components is None:
+			_, _, components = self.__solver.solve(self.__budget)
+			self.__moveWork += self.__solver.lastNodes
+		if self.__solver.lastComplete:
+			probabilities, interiorProb = self.__solver.mineProbabilities(components, self.__minesLeft)
+		else:
+			probabilities, interiorProb = self.__estimateProbabilities(components)
+
+		min_value: float = 2.0
 		min_x, min_y = 0, 0
-		for x in range(grid.getNumCols()):
-			for y in range(grid.getNumRows()):
-				if grid.getState(x,y) == State.UNKNOWN and self.__pscores[x][y] < min_value:
-					min_value = self.__pscores[x][y]
-					min_x, min_y = x, y
-					if (min_value == 0):
-						return (min_x, min_y)
+		for (x,y), prob in probabilities.items():
+			if prob < min_value:
+				min_value = prob
+				min_x, min_y = x, y
+		# Every interior tile has the same probability, so any one of them will do
+		interiorSet: set = grid.frontier.interiorSet
+		if interiorSet and interiorProb < min_value:
+			min_x, min_y = next(iter(interiorSet))
 		return min_x, min_y
 
 
+	def __estimateProbabilities(self, components: list) -> tuple[dict[tuple[int,int], float], float]:
+		"""
+		Cheap stand-in for `FrontierSolver.mineProbabilities` when not every
+		component was solved. Solved components use their own ratio of mine
+		assignments, other frontier tiles the highest density of mines still
+		needed around them and interior tiles the density of the whole board.
+		"""
+		grid: GameGrid = self.__grid
+		probabilities: dict[tuple[int,int], float] = {}
+		for x,y in grid.frontier.dangerSet:
+			unknownTiles: list[tuple[int,int]] = grid.getAdjUnknownList(x,y)
+			density: float = (grid.getState(x,y) - grid.getNumAdjFlagged(x,y)) / len(unknownTiles)
+			for tile in unknownTiles:
+				if density > probabilities.get(tile, -1.0):
+					probabilities[tile] = density
+		for component in components:
+			total: int = component.numSolutions()
+			for tile, n in zip(component.tiles, component.mineCounts()):
+				probabilities[tile] = n / total if total else 1.0
+		numUnknown: int = len(grid.unknownSet)
+		return probabilities, self.__minesLeft / numUnknown if numUnknown else 1.0
+
 
 	def __shallowSearch(self, x: int, y: int, searchType: SearchType) -> tuple[list[tuple[int,int]],list[tuple[int,int]]]:
 		"""
@@ -161,61 +458,50 @@ class MyAI( AI ):
 		validationTiles: list[tuple[int,int]] = list(validationTilesSet)
 
 		# Initialize values of search tile grid spaces
-		if oneSafeMode:
+		marker: int = grid.checkpoint()
+		if self.__bitboard:
+			bits: list[int] = [grid.getTileMask(sX,sY) for sX,sY in searchTiles]
+			searchMask: int = sum(bits)
+			constraints: list[tuple[int,int,int]] = grid.getConstraints(validationTiles, searchMask)
+		elif oneSafeMode:
 			for sX,sY in searchTiles:
 				grid.setState(sX, sY, State.FLAG)
 		else:
 			for sX,sY in searchTiles:
 				grid.setState(sX, sY, 0)
 		
-		# Create list for storaing valid tile configs
-		# True = safe, False = mine
-		validConfigs: list[list[bool]] = []
+		# Tiles that were safe (mines) in every valid configuration so far, bit j
+		# standing for searchTiles[j]
+		allTiles: int = (1 << len(searchTiles)) - 1
+		alwaysSafe: int = allTiles
+		alwaysMine: int = allTiles
+		self.__moveWork += len(searchTiles)
 		# Check configuration for each tile having a different assignment
 		for i in range(len(searchTiles)):
 			# Update to next configuration
-			if oneSafeMode:
-				grid.setState(searchTiles[i-1][0], searchTiles[i-1][1], State.FLAG)
-				grid.setState(searchTiles[i][0], searchTiles[i][1], 0)
+			if self.__bitboard:
+				mines: int = searchMask ^ bits[i] if oneSafeMode else bits[i]
+				valid: bool = grid.isConsistent(constraints, mines)
 			else:
-				grid.setState(searchTiles[i-1][0], searchTiles[i-1][1], 0)
-				grid.setState(searchTiles[i][0], searchTiles[i][1], State.FLAG)
-			
-			# If the configuration is valid, store it
-			valid: bool = True
-			for vX,vY in validationTiles:
-				if (grid.getNumAdjFlagged(vX,vY) + grid.getNumAdjUnknown(vX,vY) < grid.getState(vX,vY) or
-						grid.getNumAdjFlagged(vX,vY) > grid.getState(vX,vY)):
-					valid = False
-					break
-			if valid:
 				if oneSafeMode:
-					validConfigs.append([j == i for j in range(len(searchTiles))])
+					grid.setState(searchTiles[i-1][0], searchTiles[i-1][1], State.FLAG)
+					grid.setState(searchTiles[i][0], searchTiles[i][1], 0)
 				else:
-					validConfigs.append([j != i for j in range(len(searchTiles))])
-
-		# Get indices of all tiles that are the same across valid configurations
-		consistentIndices: list[int] = []
-		for i in range(len(validConfigs[0])):
-			consistent: bool = True
-			for j in range(len(validConfigs) - 1):
-				if validConfigs[j][i] != validConfigs[j+1][i]:
-					consistent = False
+					grid.setState(searchTiles[i-1][0], searchTiles[i-1][1], 0)
+					grid.setState(searchTiles[i][0], searchTiles[i][1], State.FLAG)
+				valid: bool = self.__isValidConfig(validationTiles)
+			
+			# If the configuration is valid, fold it into the running masks and stop
+			# once no tile is the same in every configuration
+			if valid:
+				mineBits: int = allTiles ^ (1 << i) if oneSafeMode else 1 << i
+				alwaysMine &= mineBits
+				alwaysSafe &= ~mineBits
+				if not (alwaysSafe or alwaysMine):
 					break
-			if consistent:
-				consistentIndices.append(i)
-		
-		safeTiles: list[tuple[int,int]] = []
-		mines: list[tuple[int,int]] = []
-		for i in consistentIndices:
-			if validConfigs[0][i]:
-				safeTiles.append(searchTiles[i])
-			else:
-				mines.append(searchTiles[i])
-		
-		for sX,sY in searchTiles:
-			grid.setState(sX,sY,State.UNKNOWN)
-		return safeTiles, mines
+
+		grid.restore(marker)
+		return self.__consistentTiles(searchTiles, alwaysSafe, alwaysMine)
 	
 
 	def __semiShallowSearch(self, x: int, y: int) -> tuple[list[tuple[int,int]],list[tuple[int,int]]]:
@@ -225,7 +511,8 @@ class MyAI( AI ):
 		Returns a tuple where the first item is a list of all known safe tiles from
 		the search and the second item is a list of all known mine locations from
 		the search. Takes more time than a shallow search and should not be used if
-        any other search/logic can be applied first.
+        any other search/logic can be applied first. Returns None if the move
+		budget runs out before every configuration was checked.
 		"""
 		grid = self.__grid
 		numAdjUnknown = grid.getNumAdjUnknown(x,y)
@@ -236,56 +523,81 @@ class MyAI( AI ):
 		for sX,sY in searchTiles:
 			validationTilesSet.update(grid.getAdjDangerList(sX, sY))
 		validationTiles: list[tuple[int,int]] = list(validationTilesSet)
+		marker: int = grid.checkpoint()
+		if self.__bitboard:
+			bits: list[int] = [grid.getTileMask(sX,sY) for sX,sY in searchTiles]
+			searchMask: int = sum(bits)
+			constraints: list[tuple[int,int,int]] = grid.getConstraints(validationTiles, searchMask)
 		
-		# Create a list for storing valid tile configs
-		# True = safe, False = mine
-		validConfigs: list[list[bool]] = []
-		# Check each configuration
+		# Tiles that were safe (mines) in every valid configuration so far, bit j
+		# standing for searchTiles[j]
+		allTiles: int = (1 << numAdjUnknown) - 1
+		alwaysSafe: int = allTiles
+		alwaysMine: int = allTiles
+		budget: MoveBudget = self.__budget
+		# Check each configuration, c holds the indices of the safe tiles
 		searchIndices: list = [x for x in range(numAdjUnknown)]
 		for i in range(2, numAdjUnknown - 1):
 			for c in combinations(searchIndices, i):
+				self.__moveWork += 1
+				if budget is not None and budget.spend(1):
+					grid.restore(marker)
+					return None
     			# Update to next configuration
-				config: list[bool] = [x in c for x in range(numAdjUnknown)]
-				#print(f"Testing config ({i})", config)
-				for j in range(len(config)):
-					if config[j]:
-						grid.setState(searchTiles[j][0], searchTiles[j][1], 0)
-					else:
-						grid.setState(searchTiles[j][0], searchTiles[j][1], State.FLAG)
+				if self.__bitboard:
+					mines: int = searchMask
+					for j in c:
+						mines ^= bits[j]
+					valid: bool = grid.isConsistent(constraints, mines)
+				else:
+					for j, (sX,sY) in enumerate(searchTiles):
+						grid.setState(sX, sY, 0 if j in c else State.FLAG)
+					valid: bool = self.__isValidConfig(validationTiles)
                 
-    			# If the configuration is valid, store it
-				valid: bool = True
-				for vX,vY in validationTiles:
-					if (grid.getNumAdjFlagged(vX,vY) + grid.getNumAdjUnknown(vX,vY) < grid.getState(vX,vY) or
-    						grid.getNumAdjFlagged(vX,vY) > grid.getState(vX,vY)):
-						valid = False
-						break
+    			# If the configuration is valid, fold it into the running masks and
+				# stop once no tile is the same in every configuration
 				if valid:
-					validConfigs.append(config)
-		# Get indices of all tiles that are the same across valid configurations
-		consistentIndices: list[int] = []
-		for i in range(len(validConfigs[0])):
-			consistent: bool = True
-			for j in range(len(validConfigs) - 1):
-				if validConfigs[j][i] != validConfigs[j+1][i]:
-					consistent = False
-					break
-			if consistent:
-				consistentIndices.append(i)
-		#print("Consistent indices", consistentIndices)
-		safeTiles: list[tuple[int,int]] = []
-		mines: list[tuple[int,int]] = []
-		for i in consistentIndices:
-			if validConfigs[0][i]:
-				safeTiles.append(searchTiles[i])
-			else:
-				mines.append(searchTiles[i])
-		
-		for sX,sY in searchTiles:
-			grid.setState(sX,sY,State.UNKNOWN)
+					safeBits: int = 0
+					for j in c:
+						safeBits |= 1 << j
+					alwaysSafe &= safeBits
+					alwaysMine &= ~safeBits
+					if not (alwaysSafe or alwaysMine):
+						grid.restore(marker)
+						return [], []
+
+		grid.restore(marker)
+		return self.__consistentTiles(searchTiles, alwaysSafe, alwaysMine)
+
+
+	@staticmethod
+	def __consistentTiles(searchTiles: list[tuple[int,int]], alwaysSafe: int, alwaysMine: int) -> tuple[list[tuple[int,int]],list[tuple[int,int]]]:
+		"""
+		Turns the masks of tiles that were safe (mines) in every valid configuration
+		into a tuple of safe tiles and mines.
+		"""
+		# A tile can only be in both masks when no configuration was valid
+		if alwaysSafe & alwaysMine:
+			return [], []
+		safeTiles: list[tuple[int,int]] = [tile for j, tile in enumerate(searchTiles) if alwaysSafe >> j & 1]
+		mines: list[tuple[int,int]] = [tile for j, tile in enumerate(searchTiles) if alwaysMine >> j & 1]
 		return safeTiles, mines
 
 
+	def __isValidConfig(self, validationTiles: list[tuple[int,int]]) -> bool:
+		"""
+		Checks the trial assignment currently written to the grid against every
+		validation tile, using the grid's running neighbour counts.
+		"""
+		grid = self.__grid
+		for vX,vY in validationTiles:
+			danger = grid.getState(vX,vY)
+			numAdjFlagged = grid.getNumAdjFlagged(vX,vY)
+			if numAdjFlagged > danger or numAdjFlagged + grid.getNumAdjUnknown(vX,vY) < danger:
+				return False
+		return True
+
+
 class GameGrid:
 	"""
 	Class to keep track of the known game state.
@@ -314,6 +626,17 @@ class GameGrid:
 		self.unknownSet: set[tuple[int, int]] = {
 			(c, r) for r in range(numRows) for c in range(numCols)
 		}
+		# Running counts of adjacent flagged/unknown tiles for every grid space
+		self.__adjFlagged: list[list[int]] = [[0 for _ in range(numRows2)] for _ in range(numCols2)]
+		self.__adjUnknown: list[list[int]] = [
+			[len(self.__adjStateList(c-1, r-1, State.UNKNOWN)) if 0 < c < numCols2-1 and 0 < r < numRows2-1 else 0
+			for r in range(numRows2)]
+			for c in range(numCols2)
+		]
+		# Previous states of spaces changed by setState, used by restore
+		self.__history: list[tuple[int, int, int]] = []
+		# Live frontier, kept up to date by updateState
+		self.frontier: FrontierIndex = FrontierIndex(self)
 
 
 	def getNumRows(self) -> int:
@@ -329,17 +652,66 @@ class GameGrid:
 		if c < 0 or r < 0 or c >= self.__numCols or r >= self.__numRows:
 			raise ValueError(f"Coordinates {r},{c} out of bounds")
 		self.unknownSet.discard((c, r))
-		if percept >= 0:
-			self.__grid[c+1][r+1] = percept
-		else:
-			self.__grid[c+1][r+1] = State.FLAG
+		state: int = percept if percept >= 0 else State.FLAG
+		if self.__grid[c+1][r+1] != state:
+			self.__writeState(c, r, state)
+		self.frontier.reveal(c, r, state)
 
 
 	def setState(self, c: int, r: int, state: int) -> None:
-		"""Directly set the state for a grid space."""
+		"""
+		Directly set the state for a grid space. Meant for trial assignments, the
+		previous state is remembered so it can be undone with `restore`.
+		"""
 		if c < 0 or r < 0 or c >= self.__numCols or r >= self.__numRows:
 			raise ValueError(f"Coordinates {r},{c} out of bounds")
+		old: int = self.__grid[c+1][r+1]
+		if old != state:
+			self.__history.append((c, r, old))
+			self.__writeState(c, r, state)
+
+
+	def checkpoint(self) -> int:
+		"""Returns a marker that `restore` can roll trial assignments back to."""
+		return len(self.__history)
+
+
+	def restore(self, marker: int) -> None:
+		"""Undo every `setState` made since `checkpoint` returned the marker."""
+		history = self.__history
+		while len(history) > marker:
+			c, r, state = history.pop()
+			self.__writeState(c, r, state)
+
+
+	def __writeState(self, c: int, r: int, state: int) -> None:
+		"""Write a state and adjust the neighbour counts of the surrounding spaces."""
+		old: int = self.__grid[c+1][r+1]
 		self.__grid[c+1][r+1] = state
+		if old == State.UNKNOWN:
+			self.__shiftCounts(self.__adjUnknown, c, r, -1)
+		elif old == State.FLAG:
+			self.__shiftCounts(self.__adjFlagged, c, r, -1)
+		if state == State.UNKNOWN:
+			self.__shiftCounts(self.__adjUnknown, c, r, 1)
+		elif state == State.FLAG:
+			self.__shiftCounts(self.__adjFlagged, c, r, 1)
+
+
+	@staticmethod
+	def __shiftCounts(counts: list[list[int]], c: int, r: int, delta: int) -> None:
+		"""Add delta to the counts of the 8 spaces around a tile."""
+		column = counts[c]
+		column[r] += delta
+		column[r+1] += delta
+		column[r+2] += delta
+		column = counts[c+1]
+		column[r] += delta
+		column[r+2] += delta
+		column = counts[c+2]
+		column[r] += delta
+		column[r+1] += delta
+		column[r+2] += delta
 
 	
 	def getState(self, c: int, r: int) -> int:
@@ -390,14 +762,22 @@ class GameGrid:
 		]
 
 	
+	def getFrontierDangerList(self) -> list[tuple[int, int]]:
+		"""
+		Returns a list containing the coordinates of all uncovered tiles with a
+		number greater than 0 that are next to at least one unknown tile.
+		"""
+		return list(self.frontier.dangerSet)
+
+
 	def getNumAdjFlagged(self, c: int, r: int) -> int:
 		"""Returns number of adjacent tiles that are flagged."""
-		return len(self.getAdjFlaggedList(c, r))
+		return self.__adjFlagged[c+1][r+1]
 	
 
 	def getNumAdjUnknown(self, c: int, r: int) -> int:
 		"""Returns number of adjacent tiles that are unknown."""
-		return len(self.getAdjUnknownList(c, r))
+		return self.__adjUnknown[c+1][r+1]
 	
 
 	def debugGrid(self) -> None:
@@ -435,3 +815,49 @@ class GameGrid:
 			line += f"{str(i-1).rjust(2)}"
 		print(line)
 		
+
+
+class FrontierIndex:
+	"""
+	Live index of the frontier owned by a grid. Updated in O(8) every time the
+	grid learns a tile through `updateState`, trial assignments made with
+	`setState` are not tracked.
+
+	`dangerSet` holds the uncovered numbered tiles next to at least one unknown
+	tile, `unknownSet` the unknown tiles next to at least one numbered tile and
+	`interiorSet` every other unknown tile.
+
+	An unknown tile can only move from the interior to the frontier, since
+	numbered tiles never become unknown again.
+	"""
+	NEIGHBOURS: tuple[tuple[int, int], ...] = tuple(
+		(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j
+	)
+
+	def __init__(self, grid: "GameGrid"):
+		self.__grid = grid
+		self.dangerSet: set[tuple[int, int]] = set()
+		self.unknownSet: set[tuple[int, int]] = set()
+		self.interiorSet: set[tuple[int, int]] = set(grid.unknownSet)
+
+
+	def reveal(self, c: int, r: int, state: int) -> None:
+		"""Update the index after tile (c, r) stopped being unknown and now has a state."""
+		grid = self.__grid
+		dangerSet = self.dangerSet
+		interiorSet = self.interiorSet
+		self.unknownSet.discard((c, r))
+		interiorSet.discard((c, r))
+
+		for i, j in self.NEIGHBOURS:
+			tile = (c+i, r+j)
+			if state > 0 and tile in interiorSet:
+				# Unknown neighbours of a new number join the frontier
+				interiorSet.remove(tile)
+				self.unknownSet.add(tile)
+			elif tile in dangerSet and grid.getNumAdjUnknown(c+i, r+j) == 0:
+				# Numbers with no unknown neighbours left drop off the frontier
+				dangerSet.remove(tile)
+
+		if state > 0 and grid.getNumAdjUnknown(c, r) > 0:
+			dangerSet.add((c, r))
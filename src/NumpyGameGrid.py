@@ -0,0 +1,218 @@
+import array
+
+import numpy as np
+
+from MyAI import State, FrontierIndex
+
+_UNKNOWN: int = int(State.UNKNOWN)
+_FLAG: int = int(State.FLAG)
+
+
+class NumpyGameGrid:
+	"""
+	NumPy backed version of `GameGrid` with the same interface.
+
+	The padded board is an int8 array alongside two arrays holding the number of
+	adjacent unknown and adjacent flagged tiles for every grid space. The count
+	arrays are updated incrementally whenever a state changes, so neighbour
+	counts are O(1) lookups, and whole-board queries such as
+	`getFrontierDangerList` are array masks.
+
+	The agent asks about one 3x3 neighbourhood at a time, where indexing a NumPy
+	array costs more than the whole Python lookup. Each array is therefore a
+	view of a flat `array.array` buffer, and single spaces are read and written
+	through the buffer while the masks run on the arrays. Every value returned
+	is a plain int.
+
+	Note: When using helper functions, grid indices start at (0, 0).
+	"""
+	def __init__(self, numCols: int, numRows: int):
+		self.__numCols: int = numCols
+		self.__numRows: int = numRows
+		height: int = numRows + 2
+		self.__height: int = height
+		size: int = (numCols + 2) * height
+
+		# Space (c, r) is at index (c+1) * height + r+1 of each buffer
+		self.__cells: array.array = array.array("b", bytes(size))
+		self.__unknownCounts: array.array = array.array("b", bytes(size))
+		self.__flaggedCounts: array.array = array.array("b", bytes(size))
+		self.__grid: np.ndarray = np.frombuffer(self.__cells, dtype=np.int8).reshape(numCols + 2, height)
+		self.__adjUnknown: np.ndarray = np.frombuffer(self.__unknownCounts, dtype=np.int8).reshape(numCols + 2, height)
+		self.__adjFlagged: np.ndarray = np.frombuffer(self.__flaggedCounts, dtype=np.int8).reshape(numCols + 2, height)
+		self.__grid[:, :] = State.BORDER
+		self.__grid[1:-1, 1:-1] = State.UNKNOWN
+
+		# Count every unknown neighbour of each grid space, excluding itself
+		unknown: np.ndarray = (self.__grid == State.UNKNOWN).astype(np.int8)
+		for i in range(3):
+			for j in range(3):
+				if i * j != 1:
+					self.__adjUnknown[1:-1, 1:-1] += unknown[i:i+numCols, j:j+numRows]
+
+		# Buffer offset, column and row delta of every neighbour, in GameGrid's order
+		self.__neighbours: tuple[tuple[int, int, int], ...] = tuple(
+			((i-1) * height + j-1, i-1, j-1) for i in range(3) for j in range(3) if i * j != 1
+		)
+
+		# Previous states of buffer indices changed by setState, used by restore
+		self.__history: list[tuple[int, int]] = []
+
+		# Create a set for keeping track of the unknown tiles
+		self.unknownSet: set[tuple[int, int]] = {
+			(c, r) for r in range(numRows) for c in range(numCols)
+		}
+		# Live frontier, kept up to date by updateState
+		self.frontier: FrontierIndex = FrontierIndex(self)
+
+
+	def getNumRows(self) -> int:
+		return self.__numRows
+
+
+	def getNumCols(self) -> int:
+		return self.__numCols
+
+
+	def updateState(self, c: int, r: int, percept: int) -> None:
+		"""Update the board information based on the percept from an action."""
+		if c < 0 or r < 0 or c >= self.__numCols or r >= self.__numRows:
+			raise ValueError(f"Coordinates {r},{c} out of bounds")
+		self.unknownSet.discard((c, r))
+		state: int = percept if percept >= 0 else _FLAG
+		i: int = (c+1) * self.__height + r+1
+		if self.__cells[i] != state:
+			self.__set(i, state)
+		self.frontier.reveal(c, r, state)
+
+
+	def setState(self, c: int, r: int, state: int) -> None:
+		"""
+		Directly set the state for a grid space. Meant for trial assignments, the
+		previous state is remembered so it can be undone with `restore`.
+		"""
+		if c < 0 or r < 0 or c >= self.__numCols or r >= self.__numRows:
+			raise ValueError(f"Coordinates {r},{c} out of bounds")
+		i: int = (c+1) * self.__height + r+1
+		old: int = self.__cells[i]
+		if old != state:
+			self.__history.append((i, old))
+			self.__set(i, state)
+
+
+	def checkpoint(self) -> int:
+		"""Returns a marker that `restore` can roll trial assignments back to."""
+		return len(self.__history)
+
+
+	def restore(self, marker: int) -> None:
+		"""Undo every `setState` made since `checkpoint` returned the marker."""
+		history = self.__history
+		while len(history) > marker:
+			i, state = history.pop()
+			self.__set(i, state)
+
+
+	def __set(self, i: int, state: int) -> None:
+		"""Writes the state of buffer index i and adjusts the neighbour counts of the surrounding spaces."""
+		cells = self.__cells
+		old: int = cells[i]
+		cells[i] = state
+		if old == _UNKNOWN:
+			self.__shiftCounts(self.__unknownCounts, i, -1)
+		elif old == _FLAG:
+			self.__shiftCounts(self.__flaggedCounts, i, -1)
+		if state == _UNKNOWN:
+			self.__shiftCounts(self.__unknownCounts, i, 1)
+		elif state == _FLAG:
+			self.__shiftCounts(self.__flaggedCounts, i, 1)
+
+
+	def __shiftCounts(self, counts: array.array, i: int, delta: int) -> None:
+		"""Add delta to the counts of the 8 spaces around buffer index i."""
+		height: int = self.__height
+		counts[i-height-1] += delta
+		counts[i-height] += delta
+		counts[i-height+1] += delta
+		counts[i-1] += delta
+		counts[i+1] += delta
+		counts[i+height-1] += delta
+		counts[i+height] += delta
+		counts[i+height+1] += delta
+
+
+	def getState(self, c: int, r: int) -> int:
+		"""Returns the state of a tile."""
+		return self.__cells[(c+1) * self.__height + r+1]
+
+
+	def getAdjFlaggedList(self, c: int, r: int) -> list[tuple[int, int]]:
+		"""Returns a list containing the coordinates of all adjacent flagged tiles."""
+		cells = self.__cells
+		i: int = (c+1) * self.__height + r+1
+		return [(c+dc, r+dr) for offset, dc, dr in self.__neighbours if cells[i + offset] == _FLAG]
+
+
+	def getAdjUnknownList(self, c: int, r: int) -> list[tuple[int, int]]:
+		"""Returns a list containing the coordinates of all adjacent unknown tiles."""
+		cells = self.__cells
+		i: int = (c+1) * self.__height + r+1
+		return [(c+dc, r+dr) for offset, dc, dr in self.__neighbours if cells[i + offset] == _UNKNOWN]
+
+
+	def getAdjUncoveredList(self, c: int, r: int) -> list[tuple[int, int]]:
+		"""Returns a list containing the coordinates of all adjacent uncovered tiles."""
+		cells = self.__cells
+		i: int = (c+1) * self.__height + r+1
+		return [(c+dc, r+dr) for offset, dc, dr in self.__neighbours if cells[i + offset] >= 0]
+
+
+	def getAdjDangerList(self, c: int, r: int) -> list[tuple[int, int]]:
+		"""
+		Returns a list containing the coordinates of all adjacent uncovered tiles
+		with a number greater than 0.
+		"""
+		cells = self.__cells
+		i: int = (c+1) * self.__height + r+1
+		return [(c+dc, r+dr) for offset, dc, dr in self.__neighbours if cells[i + offset] > 0]
+
+
+	def getFrontierDangerList(self) -> list[tuple[int, int]]:
+		"""
+		Returns a list containing the coordinates of all uncovered tiles with a
+		number greater than 0 that are next to at least one unknown tile.
+		"""
+		mask: np.ndarray = (self.__grid > 0) & (self.__adjUnknown > 0)
+		return [(c-1, r-1) for c, r in np.argwhere(mask).tolist()]
+
+
+	def getNumAdjFlagged(self, c: int, r: int) -> int:
+		"""Returns number of adjacent tiles that are flagged."""
+		return self.__flaggedCounts[(c+1) * self.__height + r+1]
+
+
+	def getNumAdjUnknown(self, c: int, r: int) -> int:
+		"""Returns number of adjacent tiles that are unknown."""
+		return self.__unknownCounts[(c+1) * self.__height + r+1]
+
+
+	def debugGrid(self) -> None:
+		"""
+		(DEBUG) Print AI's knowledge of the entire grid. Uses the same legend as
+		`GameGrid.debugGrid`.
+		"""
+		for i in range(self.__numRows, 0, -1):
+			line: str = f"{str(i-1).rjust(2)} | "
+			for j in range(1, self.__numCols + 1):
+				state: int = self.__cells[j * self.__height + i]
+				if state >= 0:
+					line += str(state) + " "
+				elif state == State.FLAG:
+					line += "X" + " "
+				elif state == State.UNKNOWN:
+					line += "." + " "
+				else:
+					line += "E" + " "
+			print(line)
+		print("AI +" + "--" * self.__numCols)
+		print("GRID" + "".join(f"{str(i).rjust(2)}" for i in range(self.__numCols)))
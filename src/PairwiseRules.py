@@ -0,0 +1,100 @@
+class PairwiseRules:
+	"""
+	Deduces safe tiles and mines from pairs of overlapping constraints.
+
+	Every numbered tile on the frontier is a constraint: `need` mines among its
+	unknown neighbours. Constraints are indexed by the unknown tiles they cover,
+	so the constraints overlapping a given one are found by looking up its own
+	tiles instead of scanning the frontier. Percepts only mark the constraints
+	around the changed tile as stale, and stale constraints are re-read from the
+	grid the next time the rules are applied.
+
+	For a pair A, B the mines B places outside A are bounded by how many of
+	B's mines can fit into the shared tiles. When the bounds pin the tiles only
+	in B, they are all safe or all mines; the subset rule (A inside B, so B \\ A
+	holds exactly needB - needA mines) and patterns like 1-2-1 are both cases
+	of this.
+	"""
+	def __init__(self, grid: "GameGrid"):
+		self.__grid = grid
+		# Numbered tile -> (its unknown neighbours, mines still needed among them)
+		self.__constraints: dict[tuple[int,int], tuple[frozenset, int]] = {}
+		# Unknown tile -> numbered tiles whose constraint covers it
+		self.__covering: dict[tuple[int,int], set[tuple[int,int]]] = {}
+		# Numbered tiles whose constraint changed since the index was last refreshed
+		self.__stale: set[tuple[int,int]] = set()
+
+
+	def update(self, x: int, y: int) -> None:
+		"""Marks the constraint of a tile as stale after it or a neighbour changed."""
+		self.__stale.add((x,y))
+
+
+	def __refresh(self, x: int, y: int) -> None:
+		"""Re-reads the constraint of a tile from the grid."""
+		grid = self.__grid
+		covering = self.__covering
+		old = self.__constraints.pop((x,y), None)
+		if old is not None:
+			for tile in old[0]:
+				constraints = covering[tile]
+				constraints.discard((x,y))
+				if not constraints:
+					del covering[tile]
+
+		danger: int = grid.getState(x,y)
+		if danger <= 0:
+			return
+		tiles: frozenset = frozenset(grid.getAdjUnknownList(x,y))
+		if not tiles:
+			return
+		self.__constraints[(x,y)] = (tiles, danger - grid.getNumAdjFlagged(x,y))
+		for tile in tiles:
+			covering.setdefault(tile, set()).add((x,y))
+
+
+	def apply(self, x: int, y: int) -> tuple[list[tuple[int,int]], list[tuple[int,int]]]:
+		"""
+		Compares the constraint of a tile with every constraint it overlaps.
+		Returns a tuple of the tiles found to be safe and the tiles found to be
+		mines.
+		"""
+		stale: set[tuple[int,int]] = self.__stale
+		while stale:
+			self.__refresh(*stale.pop())
+
+		entry = self.__constraints.get((x,y))
+		if entry is None:
+			return [], []
+		tilesA, needA = entry
+
+		partners: set[tuple[int,int]] = set()
+		for tile in tilesA:
+			partners.update(self.__covering[tile])
+		partners.discard((x,y))
+
+		safeTiles: set[tuple[int,int]] = set()
+		mines: set[tuple[int,int]] = set()
+		for partner in partners:
+			tilesB, needB = self.__constraints[partner]
+			self.__compare(tilesA, needA, tilesB, needB, safeTiles, mines)
+			self.__compare(tilesB, needB, tilesA, needA, safeTiles, mines)
+		return list(safeTiles), list(mines)
+
+
+	@staticmethod
+	def __compare(tilesA: frozenset, needA: int, tilesB: frozenset, needB: int, safeTiles: set, mines: set) -> None:
+		"""Adds what constraint A tells about the tiles of B that A does not cover."""
+		onlyB: frozenset = tilesB - tilesA
+		if not onlyB:
+			return
+		numShared: int = len(tilesB) - len(onlyB)
+		numOnlyA: int = len(tilesA) - numShared
+		# The shared tiles hold at most min(needA, shared) and at least
+		# needA - |A \ B| of B's mines
+		mostOutside: int = needB - max(needA - numOnlyA, 0)
+		leastOutside: int = needB - min(needA, numShared)
+		if mostOutside == 0:
+			safeTiles.update(onlyB)
+		elif leastOutside == len(onlyB):
+			mines.update(onlyB)
@@ -0,0 +1,174 @@
+from collections import OrderedDict
+
+from MyAI import State
+
+# The shallow searches never read further than 2 spaces from the tile
+WINDOW_RADIUS = 2
+# Key value of spaces that do not affect the search result
+BLANK = -4
+
+
+class PatternCache:
+	"""
+	LRU cache of local search outcomes keyed by the board pattern around a tile.
+
+	The key is the 5x5 window around the tile, which holds every space the
+	shallow searches read: the tile's unknown neighbours (the search tiles) and
+	the numbered tiles next to them. It is normalised over the 8 rotations and
+	reflections of the square so mirrored or rotated copies of a shape share
+	one entry. Only what decides the search result goes into the key: each
+	numbered tile next to a search tile is stored as the mines it still needs
+	and how many of its unknown neighbours are not search tiles (capped at the
+	mines needed, more cannot change the result), and every other space is
+	blank. Tiles with equal keys always have the same result, which is
+	stored as offsets in the normalised frame and turned back into board
+	positions on a hit.
+
+	One cache is shared by every agent in the process (see `shared`), so it
+	keeps filling up across all worlds of a directory run. Patterns missing
+	from the cache are looked up in the precomputed `table` (see PatternTable)
+	before searching.
+	"""
+	__sharedCache: "PatternCache" = None
+
+	def __init__(self, capacity: int = 4096):
+		self.capacity: int = capacity
+		self.hits: int = 0
+		self.misses: int = 0
+		self.evictions: int = 0
+		self.tableHits: int = 0 # Hits answered by the precomputed table
+		self.table: "PatternTable" = None
+		self.__entries: OrderedDict = OrderedDict()
+
+		self.__offsets: list[tuple[int,int]] = [
+			(dx, dy) for dx in range(-WINDOW_RADIUS, WINDOW_RADIUS + 1) for dy in range(-WINDOW_RADIUS, WINDOW_RADIUS + 1)
+		]
+		self.__index: dict[tuple[int,int], int] = {offset: i for i, offset in enumerate(self.__offsets)}
+		index = self.__index
+		symmetries = [
+			lambda u, v: (u, v), lambda u, v: (-u, v), lambda u, v: (u, -v), lambda u, v: (-u, -v),
+			lambda u, v: (v, u), lambda u, v: (-v, u), lambda u, v: (v, -u), lambda u, v: (-v, -u),
+		]
+		# For each symmetry, the window position read into each key position
+		self.__perms: list[list[int]] = [
+			[index[symmetry(u, v)] for u, v in self.__offsets] for symmetry in symmetries
+		]
+		# ...and the inverse, window position -> key position
+		self.__inverses: list[list[int]] = []
+		for perm in self.__perms:
+			inverse: list[int] = [0] * len(perm)
+			for i, j in enumerate(perm):
+				inverse[j] = i
+			self.__inverses.append(inverse)
+
+
+	@classmethod
+	def shared(cls) -> "PatternCache":
+		"""Returns the process-wide cache used by agents that are not given their own."""
+		if cls.__sharedCache is None:
+			cls.__sharedCache = cls()
+		return cls.__sharedCache
+
+
+	def cached(self, grid: "GameGrid", x: int, y: int, search) -> tuple[list[tuple[int,int]], list[tuple[int,int]]]:
+		"""
+		Returns search(x, y), a tuple of safe tiles and mines, from the cache if the
+		pattern around (x, y) has been searched before. A search that gives up by
+		returning None is not cached.
+		"""
+		key, symmetry = self.__encode(grid, x, y)
+		entry = self.__entries.get(key)
+		perm: list[int] = self.__perms[symmetry]
+		offsets: list[tuple[int,int]] = self.__offsets
+		if entry is not None:
+			self.hits += 1
+			self.__entries.move_to_end(key)
+		elif self.table is not None:
+			entry = self.table.lookup(key)
+			if entry is not None:
+				self.hits += 1
+				self.tableHits += 1
+				self.__store(key, entry)
+		if entry is not None:
+			return tuple(
+				[(x + offsets[perm[i]][0], y + offsets[perm[i]][1]) for i in positions]
+				for positions in entry
+			)
+
+		self.misses += 1
+		result = search(x, y)
+		if result is None:
+			return None
+		inverse: list[int] = self.__inverses[symmetry]
+		index: dict[tuple[int,int], int] = self.__index
+		self.__store(key, tuple(
+			[inverse[index[(tX - x, tY - y)]] for tX, tY in tiles]
+			for tiles in result
+		))
+		return result
+
+
+	def entries(self) -> list[tuple[tuple, tuple[list[int], list[int]]]]:
+		"""
+		Returns every cached (key, (safe positions, mine positions)) pair, positions
+		being indices into the normalised 5x5 window.
+		"""
+		return list(self.__entries.items())
+
+
+	def __store(self, key: tuple, entry: tuple[list[int], list[int]]) -> None:
+		"""Adds an entry, evicting the least recently used one when full."""
+		self.__entries[key] = entry
+		if len(self.__entries) > self.capacity:
+			self.__entries.popitem(last=False)
+			self.evictions += 1
+
+
+	def hitRate(self) -> float:
+		"""Returns the fraction of lookups answered from the cache."""
+		lookups: int = self.hits + self.misses
+		return self.hits / lookups if lookups else 0.0
+
+
+	def report(self) -> str:
+		"""Returns a one line summary of the cache statistics."""
+		return "Pattern cache: {} hits ({} from table), {} misses ({:.1%} hit rate), {} entries, {} evictions".format(
+			self.hits, self.tableHits, self.misses, self.hitRate(), len(self.__entries), self.evictions
+		)
+
+
+	def __encode(self, grid: "GameGrid", x: int, y: int) -> tuple[tuple, int]:
+		"""
+		Returns the normalised key of the window around (x, y) and the index of the
+		symmetry that produced it.
+		"""
+		searchTiles: list[tuple[int,int]] = grid.getAdjUnknownList(x,y)
+		values: list[int] = [BLANK] * len(self.__offsets)
+		index: dict[tuple[int,int], int] = self.__index
+		for sX,sY in searchTiles:
+			values[index[(sX - x, sY - y)]] = State.UNKNOWN
+		numCols: int = grid.getNumCols()
+		numRows: int = grid.getNumRows()
+		for dx, dy in self.__offsets:
+			c, r = x + dx, y + dy
+			if c < 0 or r < 0 or c >= numCols or r >= numRows:
+				continue
+			# Only tiles with a number above 0 are checked by the searches
+			danger: int = grid.getState(c, r)
+			if danger <= 0:
+				continue
+			numSearch: int = sum(1 for sX,sY in searchTiles if abs(sX - c) <= 1 and abs(sY - r) <= 1)
+			if numSearch == 0:
+				continue
+			# Other unknown neighbours only matter while there are fewer of them
+			# than mines needed
+			need: int = danger - grid.getNumAdjFlagged(c, r)
+			values[index[(dx, dy)]] = need + 9 * min(grid.getNumAdjUnknown(c, r) - numSearch, need)
+
+		best: tuple = None
+		bestSymmetry: int = 0
+		for symmetry, perm in enumerate(self.__perms):
+			key: tuple = tuple([values[i] for i in perm])
+			if best is None or key < best:
+				best, bestSymmetry = key, symmetry
+		return best, bestSymmetry
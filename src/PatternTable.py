@@ -0,0 +1,155 @@
+"""
+Precomputed table of semi-shallow search results.
+
+The table is built offline by playing seeded generated worlds with the legacy
+search path and recording every pattern key `PatternCache` produced together
+with its result, so it holds the 5x5 patterns that actually come up in play
+(enumerating every possible window is far too large). Agents then memory map
+the file, so all worker processes of a bulk run read the same pages and no
+process has to warm a cache up first. All integers are little endian.
+
+	header		"MSPT" magic, uint8 version, uint32 number of records
+	records		sorted by key, each:
+				  key, 25 bytes, pattern value + 4 per window position
+				  uint32 mask of safe window positions
+				  uint32 mask of mine window positions
+
+Build a table next to this file, where `MyAI` looks for it:
+
+	python PatternTable.py [--games N] [--seed S] [OutputFile]
+"""
+
+import argparse
+import mmap
+import os
+import struct
+
+MAGIC = b"MSPT"
+VERSION = 1
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns.mspt")
+
+_HEADER = struct.Struct("<4sBI")
+_MASKS = struct.Struct("<II")
+KEY_SIZE = 25
+RECORD_SIZE = KEY_SIZE + _MASKS.size
+
+# Every pattern value is at least BLANK (-4)
+_KEY_BIAS = 4
+
+
+def packKey(key: tuple) -> bytes:
+	"""Turns a `PatternCache` key into the bytes stored in the table."""
+	return bytes([v + _KEY_BIAS for v in key])
+
+
+def _toMask(positions: list[int]) -> int:
+	mask: int = 0
+	for i in positions:
+		mask |= 1 << i
+	return mask
+
+
+def _fromMask(mask: int) -> list[int]:
+	return [i for i in range(KEY_SIZE) if mask >> i & 1]
+
+
+class PatternTable:
+	"""
+	Read-only view of a pattern table. Records are fixed size and sorted by key,
+	so a lookup is a binary search over the memory mapped file.
+	"""
+	__opened: dict[str, "PatternTable"] = {}
+
+	def __init__(self, filename: str):
+		self.filename: str = filename
+		with open(filename, 'rb') as file:
+			self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		magic, version, self.__count = _HEADER.unpack_from(self.__map, 0)
+		if magic != MAGIC or version != VERSION:
+			raise ValueError(f"{filename} is not a version {VERSION} pattern table")
+
+
+	@classmethod
+	def load(cls, filename: str = DEFAULT_PATH) -> "PatternTable":
+		"""
+		Returns the table in a file, mapping it only once per process. Returns None
+		if the file does not exist.
+		"""
+		if filename not in cls.__opened:
+			cls.__opened[filename] = cls(filename) if os.path.isfile(filename) else None
+		return cls.__opened[filename]
+
+
+	def __len__(self) -> int:
+		return self.__count
+
+
+	def lookup(self, key: tuple) -> tuple[list[int], list[int]]:
+		"""
+		Returns the safe and mine window positions stored for a pattern key, or
+		None if the pattern is not in the table.
+		"""
+		target: bytes = packKey(key)
+		data = self.__map
+		low, high = 0, self.__count
+		while low < high:
+			middle: int = (low + high) // 2
+			offset: int = _HEADER.size + middle * RECORD_SIZE
+			found: bytes = data[offset:offset + KEY_SIZE]
+			if found < target:
+				low = middle + 1
+			elif found > target:
+				high = middle
+			else:
+				safeMask, mineMask = _MASKS.unpack_from(data, offset + KEY_SIZE)
+				return _fromMask(safeMask), _fromMask(mineMask)
+		return None
+
+
+	def close(self) -> None:
+		self.__map.close()
+
+
+def writeTable(filename: str, entries) -> int:
+	"""
+	Writes (key, (safe positions, mine positions)) pairs, e.g. from
+	`PatternCache.entries`, to a table file. Returns how many were written.
+	"""
+	records: list[tuple[bytes, int, int]] = sorted(
+		(packKey(key), _toMask(safe), _toMask(mines)) for key, (safe, mines) in entries
+	)
+	with open(filename, 'wb') as file:
+		file.write(_HEADER.pack(MAGIC, VERSION, len(records)))
+		for key, safeMask, mineMask in records:
+			file.write(key)
+			file.write(_MASKS.pack(safeMask, mineMask))
+	return len(records)
+
+
+def buildTable(filename: str, games: int = 1000, seed: int = 0) -> int:
+	"""
+	Plays `games` seeded worlds of each standard board size with the legacy
+	search path and writes every pattern it searched to a table file.
+	"""
+	from Generator import WorldGenerator
+	from MyAI import MyAI
+	from PatternCache import PatternCache
+	from Simulator import simulate
+
+	cache = PatternCache(capacity=float("inf"))
+	def agent(*args):
+		return MyAI(*args, useFrontierSolver=False, patternCache=cache)
+
+	for rows, cols, mines in ((8, 8, 10), (16, 16, 40), (16, 30, 99)):
+		for _ in simulate(WorldGenerator(rows, cols, mines, seed).stream(games), agent):
+			pass
+	return writeTable(filename, cache.entries())
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Build the precomputed pattern table", prog="PatternTable.py")
+	parser.add_argument("output", help="table file to write", nargs="?", default=DEFAULT_PATH)
+	parser.add_argument("--games", help="games per board size", type=int, default=1000)
+	parser.add_argument("--seed", help="world seed", type=int, default=0)
+	args = parser.parse_args()
+	print("Wrote {} patterns to {}".format(buildTable(args.output, args.games, args.seed), args.output))
@@ -0,0 +1,42 @@
+from World import World
+from Corpus import WorldRecord, expandWorlds
+
+
+class GameResult:
+	"""Outcome of one headless game played by `simulate`."""
+	def __init__(self, name: str, world: World):
+		self.world: str = name
+		self.rows, self.cols = world.getDimensions()
+		self.won: bool = world.isWon()
+		self.moves: int = world.getMovesMade()
+		self.flags: int = world.getFlagsPlaced()
+		self.uncovered: int = world.getScore()
+		self.agentTime: float = world.getAgentTime()
+
+
+	def __repr__(self) -> str:
+		return ("GameResult(world={!r}, size={}x{}, won={}, moves={}, flags={}, uncovered={}, agentTime={:.6f})"
+			.format(self.world, self.rows, self.cols, self.won, self.moves, self.flags, self.uncovered, self.agentTime))
+
+
+def simulate(worlds, agentFactory=None, profiler=None) -> "generator of GameResult":
+	"""
+	Plays every world in-process without printing anything and yields a
+	`GameResult` for each game as soon as it finishes. `worlds` can name text
+	world files, directories, corpus files or WorldRecords (see
+	`Corpus.expandWorlds`).
+
+	`agentFactory` is called as agentFactory(rowDimension, colDimension,
+	totalMines, startX, startY) and must return an agent, so an agent class can
+	be passed directly. MyAI is used when it is None. An optional MoveProfiler
+	collects per-move latency.
+	"""
+	for source in expandWorlds(worlds):
+		if isinstance(source, WorldRecord):
+			world = World(record=source, agentFactory=agentFactory, quiet=True, profiler=profiler)
+			name = source.name
+		else:
+			world = World(filename=source, agentFactory=agentFactory, quiet=True, profiler=profiler)
+			name = source
+		world.run()
+		yield GameResult(name, world)
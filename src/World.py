@@ -12,43 +12,61 @@
 # ==============================CS-199==================================
 
 import random
-from ManualAI import ManualAI
-from RandomAI import RandomAI
-from MyAI import MyAI
+from time import perf_counter
+from array import array
+from operator import or_
 from AI import AI
+from Agents import getAgent
+from Generator import WorldGenerator
 
+# Moves an agent may return, checked once per turn
+VALID_MOVES = frozenset(AI.Action)
 
-class World():
 
-	# Tile class
-	class __Tile():
-		mine = False
-		covered = True
-		flag = False
-		number = 0
-		
+class World():
 
-	def __init__(self, filename=None, aiType="myai", verbose=False, debug=False):
+	def __init__(self, filename=None, aiType="myai", verbose=False, debug=False, agentFactory=None, quiet=False, record=None, profiler=None, floodFill=False):
 		self.__verbose = verbose
 		self.__debug = debug
+		self.__quiet = quiet		# Suppress all console output (headless runs)
+		self.__floodFill = floodFill	# Uncovering a 0 also uncovers its whole zero region
+		self.__revealed = []		# (x, y, number) of tiles flood filled since the agent last saw them
 
 		self.__colDimension = 0
 		self.__rowDimension = 0
 		self.__score = 0
-		self.__board = None
+		# Board stored as flat buffers, tile (c, r) is at index c * rowDimension + r
+		self.__mine = None
+		self.__covered = None
+		self.__flag = None
+		self.__number = None
 		self.__totalMines = 0
 		self.__flagsLeft = 0
 		self.__coveredTiles = 0
 		self.__movesMade = 0
 		self.__movesLimit = 0
+		self.__agentTime = 0.0		# Seconds spent inside the agent's getAction
+		self.__profiler = profiler	# Optional MoveProfiler collecting per-move latency
 
 		self.__perceptNumber = 0
-		self.__lastTile = None
+		self.__lastX = None		# 0-indexed coordinates of the last move
+		self.__lastY = None
 		self.__lastAction = None
 
 		try:
+		# If a packed world record is provided, construct board from it
+			if record != None:
+				filename = record.name
+				self.__loadRecord(record)
+				firstMoveCoords = (record.startX, record.startY)
+				self.__coveredTiles = self.__colDimension * self.__rowDimension
+				self.__flagsLeft = self.__totalMines
+				self.__uncoverTile(firstMoveCoords[0], firstMoveCoords[1])
+				self.__lastX, self.__lastY = firstMoveCoords
+				self.__lastAction = "UNCOVER"
+
 		# If file is provided, construct board based on file
-			if filename != None:
+			elif filename != None:
 				with open(filename, 'r') as file:
 					self.__createBoard(file)
 					firstMoveCoords = self.__getFirstMove(file)
@@ -57,61 +75,66 @@ class World():
 					self.__coveredTiles = self.__colDimension * self.__rowDimension
 					self.__flagsLeft = self.__totalMines
 					self.__uncoverTile(firstMoveCoords[0], firstMoveCoords[1])
-					self.__lastTile = (firstMoveCoords[0]+1, firstMoveCoords[1]+1)
+					self.__lastX, self.__lastY = firstMoveCoords
 					self.__lastAction = "UNCOVER"
 					
-		# If file not provided, construct board using defaults
+		# If file not provided, construct a random board using defaults
 			else:
-				self.__createBoard()
-				self.__addMines()
-				self.__addNumbers()
-				firstMoveCoords = self.__getFirstMove()
+				defaultWorld = WorldGenerator(8, 8, 10, seed=random.getrandbits(64)).generate()
+				self.__loadRecord(defaultWorld)
+				firstMoveCoords = (defaultWorld.startX, defaultWorld.startY)
 				self.__coveredTiles = self.__colDimension * self.__rowDimension
 				self.__flagsLeft = self.__totalMines
 				self.__uncoverTile(firstMoveCoords[0], firstMoveCoords[1])
-				self.__lastTile = (firstMoveCoords[0]+1, firstMoveCoords[1]+1)
+				self.__lastX, self.__lastY = firstMoveCoords
 				self.__lastAction = "UNCOVER"
 
 		except ValueError as e:
-			print("Error: Cannot create board!")
+			if not self.__quiet:
+				print("Error: Cannot create board!")
+
+		# Agents are looked up by name in the registry, which imports only the chosen one
+		if agentFactory:
+			self.__ai = agentFactory(self.__rowDimension, self.__colDimension, self.__totalMines, firstMoveCoords[0], firstMoveCoords[1])
+			self.__isManual = False
+		else:
+			agent = getAgent(aiType)
+			self.__ai = agent.create(self.__rowDimension, self.__colDimension, self.__totalMines, firstMoveCoords[0], firstMoveCoords[1])
+			self.__isManual = agent.interactive
+
+		# Checked every move, so only work it out once
+		self.__showBoard = self.__isManual or self.__debug
 
-		if aiType == "manual":
-			self.__ai = ManualAI()
-		elif aiType == "random":
-			self.__ai = RandomAI(self.__rowDimension, self.__colDimension, self.__totalMines, firstMoveCoords[0], firstMoveCoords[1])
-		elif aiType == "myai":
-			self.__ai = MyAI(self.__rowDimension, self.__colDimension, self.__totalMines, firstMoveCoords[0], firstMoveCoords[1])
+		# Flood filled tiles are passed along with the percepts of a batch
+		if floodFill and getattr(self.__ai, "getActions", None) is None:
+			raise ValueError("Flood fill mode needs an agent with getActions")
 
-		if (self.__verbose and filename):
+		# Agents may report which solver path each move took and whether it ran out
+		# of its move budget
+		self.__moveInfo = getattr(self.__ai, "getMoveInfo", None)
+		self.__budgetHit = getattr(self.__ai, "wasBudgetHit", None)
+
+		if (self.__verbose and filename and not self.__quiet):
 			print("Running on world: " + filename)
 
 
 	def run(self) -> int:
 		""" Engine of the game """
-		while (True):
-			if type(self.__ai) == ManualAI or self.__debug:
-				self.__printWorld()
-			if self.__movesMade > self.__movesLimit:
-				break;
-
-			try: 
-				action = self.__ai.getAction(self.__perceptNumber)
-				if self.__checkValidAction(action):
-					if self.__doMove(action):
-						break
-			except ValueError:
-				print("Error: Invalid action!")
-			except IndexError:
-				print("Error: Move is out of bounds!")
-
-			if self.__debug and type(self.__ai) != ManualAI:
-				input("Press ENTER to continue...")
+		# Agents with a getActions method play in batches, except when every move
+		# has to be shown
+		getActions = getattr(self.__ai, "getActions", None)
+		if getActions is not None and (self.__floodFill or not self.__showBoard):
+			self.__runBatched(getActions)
+		else:
+			self.__runSingle()
+		if self.__profiler is not None:
+			self.__recordCounters()
 		self.__handleGameover()
 		self.__uncoverAll()
-		if type(self.__ai) == ManualAI or self.__debug:
+		if self.__showBoard:
 			self.__printWorld()
 
-		if self.__score == (self.__colDimension * self.__rowDimension) - self.__totalMines:
+		if self.isWon():
 			if self.__rowDimension == 8 and self.__colDimension == 8:
 				return 1
 			elif self.__rowDimension == 16 and self.__colDimension == 16:
@@ -124,162 +147,298 @@ class World():
 			return 0
 
 
+	def __runSingle(self) -> None:
+		""" Play one getAction call per move until the game is over """
+		while (True):
+			if self.__showBoard:
+				self.__printWorld()
+			if self.__movesMade > self.__movesLimit:
+				break;
+
+			try: 
+				start = perf_counter()
+				action = self.__ai.getAction(self.__perceptNumber)
+				elapsed = perf_counter() - start
+				self.__agentTime += elapsed
+				if self.__profiler is not None:
+					self.__recordMove(elapsed)
+				move, X, Y = action.getMove(), action.getX(), action.getY()
+				if self.__checkValidAction(move, X, Y):
+					if self.__doMove(move, X, Y):
+						break
+			except ValueError:
+				if not self.__quiet:
+					print("Error: Invalid action!")
+			except IndexError:
+				if not self.__quiet:
+					print("Error: Move is out of bounds!")
+
+			if self.__debug and not self.__isManual:
+				input("Press ENTER to continue...")
+
+
+	def __runBatched(self, getActions: "method") -> None:
+		""" Apply every action of a getActions batch, then pass back all of their percepts in order """
+		""" In flood fill mode the tiles uncovered by flood fills are passed too. An empty batch ends the game like LEAVE """
+		percepts = [self.__perceptNumber]
+		while self.__movesMade <= self.__movesLimit:
+			if self.__showBoard:
+				self.__printWorld()
+			start = perf_counter()
+			if self.__floodFill:
+				revealed, self.__revealed = self.__revealed, []
+				actions = getActions(percepts, revealed)
+			else:
+				actions = getActions(percepts)
+			elapsed = perf_counter() - start
+			self.__agentTime += elapsed
+			if self.__profiler is not None:
+				self.__recordMove(elapsed, max(len(actions), 1))
+			if not actions:
+				return
+
+			percepts = []
+			for action in actions:
+				if self.__movesMade > self.__movesLimit:
+					return
+				try:
+					move, X, Y = action.getMove(), action.getX(), action.getY()
+					if self.__checkValidAction(move, X, Y):
+						if self.__doMove(move, X, Y):
+							return
+				except ValueError:
+					if not self.__quiet:
+						print("Error: Invalid action!")
+				except IndexError:
+					if not self.__quiet:
+						print("Error: Move is out of bounds!")
+				# Invalid actions get the last percept again, like in single moves
+				percepts.append(self.__perceptNumber)
+
+			if self.__debug:
+				input("Press ENTER to continue...")
+
+
+	###############################################
+	#				GAME STATISTICS				  #
+	###############################################
+	def isWon(self) -> bool:
+		""" Returns true if every safe tile was uncovered, only meaningful after run """
+		return self.__score == (self.__colDimension * self.__rowDimension) - self.__totalMines
+
+
+	def getScore(self) -> int:
+		""" Returns the number of safe tiles the agent uncovered, only meaningful after run """
+		return self.__score
+
+
+	def getMovesMade(self) -> int:
+		""" Returns the number of moves the agent has made """
+		return self.__movesMade
+
+
+	def getFlagsPlaced(self) -> int:
+		""" Returns the number of flags currently on the board """
+		return self.__totalMines - self.__flagsLeft
+
+
+	def getAgentTime(self) -> float:
+		""" Returns the total seconds spent inside the agent's getAction """
+		return self.__agentTime
+
+
+	def getDimensions(self) -> "tuple of ints":
+		""" Returns the (rowDimension, colDimension) of the board """
+		return (self.__rowDimension, self.__colDimension)
+
+
+	def __recordMove(self, seconds: float, moves: int = 1) -> None:
+		""" Pass the latency and solver path of the last call to the profiler, one sample per move """
+		""" A batch's time is split evenly over its moves; the search ran for the first, the rest were queued """
+		path, work = self.__moveInfo() if self.__moveInfo else ("unknown", 0)
+		size = (self.__rowDimension, self.__colDimension)
+		self.__profiler.record(size, seconds / moves, getattr(path, "name", str(path)).lower(), work)
+		for _ in range(moves - 1):
+			self.__profiler.record(size, seconds / moves, "queued", 0)
+		if self.__budgetHit and self.__budgetHit():
+			self.__profiler.count("budget hits")
+
+
+	def __recordCounters(self) -> None:
+		""" Pass the agent's own event counts for the game (e.g. pattern cache hits) to the profiler """
+		getCounters = getattr(self.__ai, "getCounters", None)
+		if getCounters is not None:
+			for name, n in getCounters().items():
+				self.__profiler.count(name, n)
+
+
 	###############################################
 	#				ACTIONS ON BOARD 			  #
 	###############################################
-	def __checkValidAction(self, actionObj: "Action Object") -> bool:
+	def __checkValidAction(self, move: "AI.Action", X: int, Y: int) -> bool:
 		""" Check if move is valid, and if coordinates are valid, returning a boolean """
-		move = actionObj.getMove()
-		X = actionObj.getX()
-		Y = actionObj.getY()
-		if move in [AI.Action.LEAVE, AI.Action.UNCOVER, AI.Action.FLAG, AI.Action.UNFLAG]:
+		if move in VALID_MOVES:
 			if self.__isInBounds(X, Y):
 				return True
 			raise IndexError
 		raise ValueError
 
 
-	def __doMove(self, actionObj: "Action Object") -> bool:
+	def __doMove(self, move: "AI.Action", X: int, Y: int) -> bool:
 		""" Perform a move on the game board based on given action and x, y coords """
 		""" Return True when game is over, False otherwise """
 		self.__movesMade += 1
+		self.__lastX, self.__lastY = X, Y
+		self.__lastAction = move.name
 
-		move = actionObj.getMove()
-		X = actionObj.getX()
-		Y = actionObj.getY()
-		self.__lastTile = (X+1, Y+1)
-		if move == AI.Action.UNCOVER:
-			self.__lastAction = "UNCOVER"
-		elif move == AI.Action.FLAG:
-			self.__lastAction = "FLAG"
-		elif move == AI.Action.UNFLAG:
-			self.__lastAction = "UNFLAG"
-		elif move == AI.Action.LEAVE:
-			self.__lastAction = "LEAVE"
-
-		# LEAVE
-		if move == AI.Action.LEAVE:
-			if type(self.__ai) == ManualAI or self.__debug:
-				print("Leaving game...")
-			return True 							# Agent decides to leave game
+		# Most common moves first
 		# UNCOVER
-		elif move == AI.Action.UNCOVER:
-			if self.__board[X][Y].mine:
-				if type(self.__ai) == ManualAI or self.__debug:
+		if move is AI.Action.UNCOVER:
+			if self.__mine[X * self.__rowDimension + Y]:
+				if self.__showBoard:
 					print("Gameover! Uncovered a mine! " + str(X+1), str(Y+1))
 				return True 						# Agent uncovered a mine
-			if type(self.__ai) == ManualAI:
+			if self.__isManual:
 				print("Uncovering: " + str(X+1) + ", " + str(Y+1))
 			self.__uncoverTile(X, Y)
 		# FLAG
-		elif move == AI.Action.FLAG:
-			if type(self.__ai) == ManualAI:
+		elif move is AI.Action.FLAG:
+			if self.__isManual:
 				print("Flagging: " + str(X+1) + ", " + str(Y+1))
 			self.__flagTile(X, Y)
 		# UNFLAG
-		elif move == AI.Action.UNFLAG:
-			if type(self.__ai) == ManualAI:
+		elif move is AI.Action.UNFLAG:
+			if self.__isManual:
 				print("Unflagging: " + str(X+1) + ", " + str(Y+1))
 			self.__unflagTile(X, Y)
+		# LEAVE
+		else:
+			if self.__showBoard:
+				print("Leaving game...")
+			return True 							# Agent decides to leave game
 		return False 								# Game continues
 
 
 	#####################################################
 	#			SETTING UP THE GAME BOARD   			#
 	#####################################################
-	def __createBoard(self, inputStream: "filePointer" = None) -> None:
-		""" Creates 2D tile array from first line of file and instantiates board instance variable """
+	def __createBoard(self, inputStream: "filePointer" = None, dimensions: "tuple of ints" = None) -> None:
+		""" Reads board dimensions from first line of file and allocates the flat board buffers """
 		if inputStream:
 			self.__rowDimension, self.__colDimension = [int(x) for x in inputStream.readline().split()]
-			self.__board = [[self.__Tile() for i in range(self.__rowDimension)] for j in range(self.__colDimension)]
 		else:
-			self.__colDimension = 8		# Default sizes
-			self.__rowDimension = 8		# Default size
+			self.__rowDimension, self.__colDimension = dimensions
 
-			self.__board = [[self.__Tile() for i in range(self.__rowDimension)] for j in range(self.__colDimension)]
+		numTiles = self.__colDimension * self.__rowDimension
+		self.__mine = bytearray(numTiles)
+		self.__covered = bytearray(b'\x01') * numTiles
+		self.__flag = bytearray(numTiles)
+		self.__number = array('b', bytes(numTiles))
 		
 		self.__movesLimit = self.__colDimension * self.__rowDimension * 2
 
 
-	def __getFirstMove(self, inputStream: "filePointer" = None) -> "tuple of ints": 
-		""" Find the first move to be given to the agent, must be a "0" tile """
-		if inputStream:
-			startX, startY = [int(x)-1 for x in inputStream.readline().split()]
-			if startX > self.__colDimension or startX < 0 or startY > self.__rowDimension or startY < 0:
-				raise ValueError('First move coordinates are invalid')
-		else:
-			startX = self.__randomInt(self.__colDimension)
-			startY = self.__randomInt(self.__rowDimension)
-			while (self.__board[startX][startY].number != 0 or self.__board[startX][startY].mine):
-				startX = self.__randomInt(self.__colDimension)
-				startY = self.__randomInt(self.__rowDimension)
+	def __loadRecord(self, record: "WorldRecord") -> None:
+		""" Creates the board, mines and hint numbers from a packed world record """
+		self.__createBoard(dimensions=(record.rows, record.cols))
+		if record.startX >= self.__colDimension or record.startY >= self.__rowDimension:
+			raise ValueError('First move coordinates are invalid')
+		self.__mine = record.mines()
+		self.__totalMines = self.__mine.count(1)
+		self.__addNumbers()
+
+
+	def __getFirstMove(self, inputStream: "filePointer") -> "tuple of ints": 
+		""" Read the first move to be given to the agent, must be a "0" tile """
+		startX, startY = [int(x)-1 for x in inputStream.readline().split()]
+		if startX > self.__colDimension or startX < 0 or startY > self.__rowDimension or startY < 0:
+			raise ValueError('First move coordinates are invalid')
 		return (startX, startY)
 
 
-	def __addMines(self, inputStream: "filePointer" = None) -> None:
+	def __addMines(self, inputStream: "filePointer") -> None:
 		""" Add mines to the game board""" 
-		if inputStream:
-			for r, line in zip(range(self.__rowDimension - 1, -1, -1), inputStream.readlines()):
-				for c, tile in zip(range(self.__colDimension), line.split()):
-					if tile == "1":
-						self.__addMine(c, r)
-		else:
-			currentMines = 0
-			while currentMines < 10:	# Default number of mines is 10
-				r = self.__randomInt(self.__rowDimension)
-				c = self.__randomInt(self.__colDimension)
-				if not self.__board[c][r].mine:
+		for r, line in zip(range(self.__rowDimension - 1, -1, -1), inputStream.readlines()):
+			for c, tile in zip(range(self.__colDimension), line.split()):
+				if tile == "1":
 					self.__addMine(c, r)
-					currentMines += 1
 
 					
 	def __addMine(self, c: int, r: int) -> None:
-		""" Add mine to tile located at (c, r) and update the Tile.mine attrbute """
-		self.__board[c][r].mine = True
+		""" Add mine to tile located at (c, r) and update the mine buffer """
+		self.__mine[c * self.__rowDimension + r] = 1
 		self.__totalMines += 1		
 
 
 	def __addNumbers(self) -> None:
-		""" Iterate the board and add hint numbers for each mine """
-		for r in range(self.__rowDimension):
-			for c in range(self.__colDimension):
-				if self.__board[c][r].mine:
-					self.__addHintNumber(c, r+1)
-					self.__addHintNumber(c, r-1)
-					self.__addHintNumber(c+1, r)
-					self.__addHintNumber(c-1, r)
-					self.__addHintNumber(c-1, r+1)
-					self.__addHintNumber(c+1, r+1)
-					self.__addHintNumber(c-1, r-1)
-					self.__addHintNumber(c+1, r-1)
-
-
-	def __addHintNumber(self, c: int, r: int) -> None:
-		""" Increment the hint number of a tile """
-		if self.__isInBounds(c, r):
-			self.__board[c][r].number += 1
+		""" Compute every hint number in one pass as a 3x3 box sum over the mine buffer """
+		rows = self.__rowDimension
+		mine = self.__mine
+		number = self.__number
+		empty = [0] * rows
+
+		def verticalSums(c: int) -> list:
+			""" Mines in each tile of column c plus the tiles directly above and below """
+			if c < 0 or c >= self.__colDimension:
+				return empty
+			column = mine[c * rows:(c+1) * rows]
+			padded = [0] + list(column) + [0]
+			return [a + b + d for a, b, d in zip(padded, padded[1:], padded[2:])]
+
+		# Slide a window of three columns across the board
+		left, middle = empty, verticalSums(0)
+		for c in range(self.__colDimension):
+			right = verticalSums(c+1)
+			start = c * rows
+			number[start:start + rows] = array('b', [
+				a + b + d - m for a, b, d, m in zip(left, middle, right, mine[start:start + rows])
+			])
+			left, middle = middle, right
 
 
 	def __uncoverTile(self, c: int, r: int) -> None:
 		""" Uncovers a tile """
-		if self.__board[c][r].covered:
-			self.__board[c][r].covered = False
+		i = c * self.__rowDimension + r
+		if self.__covered[i]:
+			self.__covered[i] = 0
 			self.__coveredTiles -= 1
-		self.__perceptNumber = self.__board[c][r].number
+		self.__perceptNumber = self.__number[i]
+		if self.__floodFill and self.__perceptNumber == 0:
+			self.__floodZeros(i)
+
+
+	def __floodZeros(self, start: int) -> None:
+		""" Breadth first search from an uncovered 0, uncovering every tile next to a 0 in its region """
+		rows = self.__rowDimension
+		cols = self.__colDimension
+		covered = self.__covered
+		flag = self.__flag
+		number = self.__number
+		revealed = self.__revealed
+		queue = [start]
+		for i in queue:
+			c, r = divmod(i, rows)
+			for nc in range(max(c-1, 0), min(c+2, cols)):
+				for j in range(nc * rows + max(r-1, 0), nc * rows + min(r+2, rows)):
+					if covered[j] and not flag[j]:
+						covered[j] = 0
+						self.__coveredTiles -= 1
+						revealed.append((nc, j - nc * rows, number[j]))
+						if number[j] == 0:
+							queue.append(j)
 
 
 	def __uncoverAll(self) -> None:
 		""" Uncovers all tiles """
-		for r in range(self.__rowDimension):
-			for c in range(self.__colDimension):
-				self.__uncoverTile(c, r)
+		self.__covered[:] = bytes(len(self.__covered))
 		self.__coveredTiles = 0
 
 
 	def __flagTile(self, c: int, r: int) -> None:
 		""" Flag a tile, coordinates adjusted to fix indexing """
-		if self.__board[c][r].covered and not self.__board[c][r].flag and self.__flagsLeft > 0:
-			self.__board[c][r].flag = True
+		i = c * self.__rowDimension + r
+		if self.__covered[i] and not self.__flag[i] and self.__flagsLeft > 0:
+			self.__flag[i] = 1
 			self.__flagsLeft -= 1
 		if self.__flagsLeft < 0:
 			self.__flagsLeft = 0
@@ -288,8 +447,9 @@ class World():
 
 	def __unflagTile(self, c: int, r: int) -> None:
 		""" Unflag a tile, coordinates adjusted to fix indexing """
-		if self.__board[c][r].covered and self.__board[c][r].flag:
-			self.__board[c][r].flag = False
+		i = c * self.__rowDimension + r
+		if self.__covered[i] and self.__flag[i]:
+			self.__flag[i] = 0
 			self.__flagsLeft += 1
 		if self.__flagsLeft > 10:
 			self.__flagsLeft = 10
@@ -298,11 +458,8 @@ class World():
 
 	def __handleGameover(self) -> None:
 		""" Check game board for completion after AI is done """
-		for r in range(self.__rowDimension):
-			for c in range(self.__colDimension):
-				# If all safe tiles are uncovered
-				if not self.__board[c][r].covered and not self.__board[c][r].mine:
-					self.__score += 1
+		# Every tile that is neither covered nor a mine is an uncovered safe tile
+		self.__score += len(self.__covered) - sum(map(or_, self.__covered, self.__mine))
 
 
 	#############################################
@@ -341,33 +498,36 @@ class World():
 
 	def __printAgentInfo(self) -> None:
 		""" Prints information about the board that are useful to the user """
-		print("Tiles covered: " + str(self.__coveredTiles) + " | Flags left: " + str(self.__flagsLeft) + " | Last action: {} on {}".format(self.__lastAction, self.__lastTile))
+		print("Tiles covered: " + str(self.__coveredTiles) + " | Flags left: " + str(self.__flagsLeft) + " | Last action: {} on {}".format(self.__lastAction, self.__lastTile()))
 
 
 	def __printActionInfo(self) -> None:
 		""" Prints available actions to the user if agent is ManualAI """
-		if type(self.__ai) == ManualAI:
+		if self.__isManual:
 			print("Press \"L\" to leave game\nPress \"U\" to uncover a tile\nPress \"F\" to flag a tile\nPress \"N\" to unflag a tile: ")
 
 
 	def __printTileInfo(self, c: int, r: int) -> None:
 		""" Checks tile attributes and prints accordingly """
-		if not self.__board[c][r].covered and self.__board[c][r].mine:
+		i = c * self.__rowDimension + r
+		if not self.__covered[i] and self.__mine[i]:
 			print('B ', end=" ")
-		elif not self.__board[c][r].covered:
-			print(str(self.__board[c][r].number) + ' ', end=" ")
-		elif self.__board[c][r].flag:
+		elif not self.__covered[i]:
+			print(str(self.__number[i]) + ' ', end=" ")
+		elif self.__flag[i]:
 			print('? ', end=" ")
-		elif self.__board[c][r].covered:
+		elif self.__covered[i]:
 			print('. ', end=" ")
-		
+			
 
 	#####################################################
 	#		         HELPER FUNCTIONS					#
 	#####################################################
-	def __randomInt(self, limit: int) -> int:
-		""" Return a random int within the range from 0 to limit """
-		return random.randrange(limit)
+	def __lastTile(self) -> "tuple of ints":
+		""" 1-indexed coordinates of the last move, as shown to the user """
+		if self.__lastX is None:
+			return None
+		return (self.__lastX+1, self.__lastY+1)
 
 
 	def __isInBounds(self, c: int, r: int) -> bool:
@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from Corpus import WorldRecord, Corpus, readWorldFile, writeCorpus, isCorpusFile, convert
+
+
+def randomRecord(rng: random.Random, name: str) -> WorldRecord:
+	rows: int = rng.randint(1, 20)
+	cols: int = rng.randint(1, 30)
+	mines: list[int] = [rng.random() < 0.2 for _ in range(rows * cols)]
+	return WorldRecord(name, rows, cols, rng.randrange(cols), rng.randrange(rows), WorldRecord.packMines(mines))
+
+
+class CorpusTest(unittest.TestCase):
+	def setUp(self):
+		self.tempDir = tempfile.TemporaryDirectory()
+		self.dir: str = self.tempDir.name
+
+
+	def tearDown(self):
+		self.tempDir.cleanup()
+
+
+	def assertSameWorld(self, record: WorldRecord, expected: WorldRecord):
+		self.assertEqual(
+			(record.name, record.rows, record.cols, record.startX, record.startY, record.mines()),
+			(expected.name, expected.rows, expected.cols, expected.startX, expected.startY, expected.mines())
+		)
+
+
+	def testPackMines(self):
+		rng = random.Random(0)
+		for size in range(1, 40):
+			mines = bytearray(rng.random() < 0.5 for _ in range(size))
+			record = WorldRecord("w", 1, size, 0, 0, WorldRecord.packMines(mines))
+			self.assertEqual(record.mines(), mines)
+
+
+	def testRoundTrip(self):
+		rng = random.Random(0)
+		records: list[WorldRecord] = [randomRecord(rng, f"world-{i}-é") for i in range(50)]
+		filename: str = os.path.join(self.dir, "worlds.mswc")
+		self.assertEqual(writeCorpus(filename, records), len(records))
+		self.assertTrue(isCorpusFile(filename))
+		with Corpus(filename) as corpus:
+			self.assertEqual(len(corpus), len(records))
+			for record, expected in zip(corpus, records):
+				self.assertSameWorld(record, expected)
+			self.assertSameWorld(corpus[-1], records[-1])
+			with self.assertRaises(IndexError):
+				corpus[len(records)]
+
+
+	def testReadWorldFile(self):
+		# 3 rows and 4 columns, the top row of the file is the highest row
+		filename: str = os.path.join(self.dir, "world.txt")
+		with open(filename, "w") as file:
+			file.write("3 4\n2 1\n0 0 0 1\n1 0 0 0\n0 0 1 0\n")
+		self.assertFalse(isCorpusFile(filename))
+		record: WorldRecord = readWorldFile(filename)
+		self.assertEqual((record.rows, record.cols, record.startX, record.startY), (3, 4, 1, 0))
+		mines = record.mines()
+		self.assertEqual({(i // 3, i % 3) for i in range(12) if mines[i]}, {(3, 2), (0, 1), (2, 0)})
+
+		corpusFile: str = os.path.join(self.dir, "worlds.mswc")
+		self.assertEqual(convert(filename, corpusFile), 1)
+		with Corpus(corpusFile) as corpus:
+			self.assertSameWorld(corpus[0], record)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,139 @@
+import os
+import random
+import sys
+import unittest
+from itertools import product
+from math import comb
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from MyAI import GameGrid
+from FrontierSolver import FrontierSolver
+
+COLS = 5
+ROWS = 5
+MINES = 6
+# Larger frontiers take too long to brute force
+MAX_FRONTIER = 12
+
+
+def neighbours(c: int, r: int) -> list[tuple[int, int]]:
+	return [
+		(c+i, r+j) for i in (-1, 0, 1) for j in (-1, 0, 1)
+		if (i or j) and 0 <= c+i < COLS and 0 <= r+j < ROWS
+	]
+
+
+def randomPosition(rng: random.Random) -> tuple[GameGrid, dict[tuple[int, int], int], int]:
+	"""
+	Plays a few random safe moves on a random board, expanding 0 tiles like the
+	agent does and flagging some of the mines next to uncovered numbers.
+	Returns the grid, the percept of every known tile and the number of mines
+	left to find.
+	"""
+	tiles: list[tuple[int, int]] = [(c, r) for c in range(COLS) for r in range(ROWS)]
+	mines: set[tuple[int, int]] = set(rng.sample(tiles, MINES))
+	known: dict[tuple[int, int], int] = {}
+	for _ in range(rng.randint(1, 3)):
+		queue: list[tuple[int, int]] = [rng.choice([t for t in tiles if t not in mines])]
+		for tile in queue:
+			if tile in known:
+				continue
+			known[tile] = sum(n in mines for n in neighbours(*tile))
+			if known[tile] == 0:
+				queue.extend(neighbours(*tile))
+	for tile in mines:
+		if rng.random() < 0.3 and any(known.get(n, 0) > 0 for n in neighbours(*tile)):
+			known[tile] = -1
+
+	grid = GameGrid(COLS, ROWS)
+	for (c, r), percept in known.items():
+		grid.updateState(c, r, percept)
+	return grid, known, MINES - sum(p < 0 for p in known.values())
+
+
+def frontierTiles(known: dict[tuple[int, int], int]) -> list[tuple[int, int]]:
+	"""Returns the unknown tiles next to an uncovered number."""
+	return sorted({
+		n for tile, percept in known.items() if percept > 0
+		for n in neighbours(*tile) if n not in known
+	})
+
+
+def validAssignments(known: dict[tuple[int, int], int], frontier: list[tuple[int, int]]) -> list[tuple[bool, ...]]:
+	"""Returns every assignment of mines to the frontier tiles that fits every number."""
+	valid: list[tuple[bool, ...]] = []
+	for assignment in product((False, True), repeat=len(frontier)):
+		isMine = dict(zip(frontier, assignment))
+		if all(
+			sum(known.get(n) == -1 or isMine.get(n, False) for n in neighbours(*tile)) == percept
+			for tile, percept in known.items() if percept > 0
+		):
+			valid.append(assignment)
+	return valid
+
+
+class FrontierSolverTest(unittest.TestCase):
+	"""Checks the solver against brute force enumeration on small random positions."""
+	def testForcedTiles(self):
+		rng = random.Random(0)
+		for _ in range(200):
+			grid, known, _ = randomPosition(rng)
+			frontier = frontierTiles(known)
+			if len(frontier) > MAX_FRONTIER:
+				continue
+			valid = validAssignments(known, frontier)
+			safeTiles, mines, _ = FrontierSolver(grid).solve()
+			self.assertEqual(sorted(safeTiles), [t for i, t in enumerate(frontier) if not any(a[i] for a in valid)])
+			self.assertEqual(sorted(mines), [t for i, t in enumerate(frontier) if all(a[i] for a in valid)])
+
+
+	def testMineProbabilities(self):
+		rng = random.Random(1)
+		for _ in range(200):
+			grid, known, minesLeft = randomPosition(rng)
+			frontier = frontierTiles(known)
+			if len(frontier) > MAX_FRONTIER:
+				continue
+			# Every frontier assignment stands for all the ways of placing the
+			# rest of the mines on the interior tiles
+			numInterior: int = COLS * ROWS - len(known) - len(frontier)
+			total = interiorMines = 0
+			tileWeights: list[int] = [0] * len(frontier)
+			for assignment in validAssignments(known, frontier):
+				rest: int = minesLeft - sum(assignment)
+				if rest < 0 or rest > numInterior:
+					continue
+				weight: int = comb(numInterior, rest)
+				total += weight
+				interiorMines += weight * rest
+				for i, mine in enumerate(assignment):
+					tileWeights[i] += weight * mine
+
+			solver = FrontierSolver(grid)
+			_, _, components = solver.solve()
+			probabilities, interiorProb = solver.mineProbabilities(components, minesLeft)
+			self.assertEqual(sorted(probabilities), frontier)
+			for tile, w in zip(frontier, tileWeights):
+				self.assertAlmostEqual(probabilities[tile], w / total)
+			if numInterior > 0:
+				self.assertAlmostEqual(interiorProb, interiorMines / (total * numInterior))
+
+
+
+	def testEnumeratorsAgree(self):
+		rng = random.Random(2)
+		for _ in range(200):
+			grid, _, _ = randomPosition(rng)
+			results = []
+			for enumerator in ("ordered", "mrv"):
+				safeTiles, mines, components = FrontierSolver(grid, enumerator).solve()
+				results.append((
+					sorted(safeTiles), sorted(mines),
+					[(c.tiles, c.counts, c.tileCounts) for c in components]
+				))
+			self.assertEqual(results[0], results[1])
+
+
+if __name__ == "__main__":
+	unittest.main()
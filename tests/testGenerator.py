@@ -0,0 +1,42 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from Generator import WorldGenerator, generateWorlds
+
+
+class WorldGeneratorTest(unittest.TestCase):
+	def testSeedReproducesWorlds(self):
+		first = [(w.startX, w.startY, w.bitmap) for w in generateWorlds(16, 30, 99, 20, seed=7)]
+		second = [(w.startX, w.startY, w.bitmap) for w in generateWorlds(16, 30, 99, 20, seed=7)]
+		self.assertEqual(first, second)
+		other = [(w.startX, w.startY, w.bitmap) for w in generateWorlds(16, 30, 99, 20, seed=8)]
+		self.assertNotEqual(first, other)
+
+
+	def testWorldOnlyDependsOnIndex(self):
+		generator = WorldGenerator(9, 9, 10, seed=3)
+		streamed = list(generator.stream(5, start=10))
+		for i, world in enumerate(streamed):
+			self.assertEqual(world.bitmap, generator.generate(10 + i).bitmap)
+
+
+	def testOpeningIsClear(self):
+		for rows, cols, mines in ((8, 8, 10), (16, 30, 99), (3, 3, 0), (1, 5, 2), (4, 4, 7)):
+			for world in generateWorlds(rows, cols, mines, 200):
+				tiles = world.mines()
+				self.assertEqual(sum(tiles), mines)
+				for c in range(max(world.startX - 1, 0), min(world.startX + 2, cols)):
+					for r in range(max(world.startY - 1, 0), min(world.startY + 2, rows)):
+						self.assertFalse(tiles[c * rows + r])
+
+
+	def testTooManyMines(self):
+		with self.assertRaises(ValueError):
+			WorldGenerator(8, 8, 56)
+
+
+if __name__ == "__main__":
+	unittest.main()
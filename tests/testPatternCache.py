@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from MyAI import GameGrid
+from PatternCache import PatternCache
+
+
+def buildGrid(edgePercept: int, flag: tuple[int, int]) -> GameGrid:
+	"""
+	7x5 grid searched around (3, 2), a 1 whose only unknown neighbour is
+	(2, 2). (1, 2) gets `edgePercept`, (1, 1) is a 1, `flag` is flagged and
+	every other tile is an uncovered 0.
+	"""
+	grid = GameGrid(7, 5)
+	percepts: dict[tuple[int, int], int] = {(3, 2): 1, (1, 1): 1, (1, 2): edgePercept, flag: -1}
+	for c in range(7):
+		for r in range(5):
+			if (c, r) != (2, 2):
+				grid.updateState(c, r, percepts.get((c, r), 0))
+	return grid
+
+
+class PatternKeyTest(unittest.TestCase):
+	"""
+	The searches never check 0 tiles, so a pending 0 next to the search tiles
+	places no constraint on them while a numbered tile that needs no more mines
+	forces them all safe. Both used to be encoded as "0 mines needed", so the
+	second position was answered with the first one's cached result.
+	"""
+	def setUp(self):
+		# (1, 2) is a 0 that has not been expanded yet ...
+		self.zeroTile = buildGrid(0, (0, 0))
+		# ... or a 1 whose mine is flagged at (0, 1). Either flag leaves (1, 1)
+		# needing no more mines, so only (1, 2) differs between the two.
+		self.fullNumber = buildGrid(1, (0, 1))
+		self.searched: list[tuple[int, int]] = []
+
+
+	def search(self, x: int, y: int) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+		self.searched.append((x, y))
+		return [], [(x-1, y)]
+
+
+	def testSamePatternHits(self):
+		cache = PatternCache()
+		cache.cached(self.zeroTile, 3, 2, self.search)
+		result = cache.cached(buildGrid(0, (0, 0)), 3, 2, self.search)
+		self.assertEqual(result, ([], [(2, 2)]))
+		self.assertEqual(len(self.searched), 1)
+		self.assertEqual(cache.hits, 1)
+
+
+	def testBothPositionsAreSearched(self):
+		cache = PatternCache()
+		cache.cached(self.zeroTile, 3, 2, self.search)
+		cache.cached(self.fullNumber, 3, 2, self.search)
+		self.assertEqual(len(self.searched), 2)
+		self.assertEqual(cache.hits, 0)
+
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,107 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from AI import AI
+from Action import Action
+from Generator import WorldGenerator
+from World import World
+
+
+def numbers(world: "WorldRecord") -> dict[tuple[int, int], int]:
+	"""Returns the number of adjacent mines of every safe tile."""
+	mines = world.mines()
+	isMine = lambda c, r: 0 <= c < world.cols and 0 <= r < world.rows and mines[c * world.rows + r]
+	return {
+		(c, r): sum(isMine(c+i, r+j) for i in (-1, 0, 1) for j in (-1, 0, 1))
+		for c in range(world.cols) for r in range(world.rows) if not isMine(c, r)
+	}
+
+
+def zeroRegion(numbers: dict[tuple[int, int], int], start: tuple[int, int]) -> set[tuple[int, int]]:
+	"""Returns every tile uncovered by uncovering the 0 at start, start included."""
+	region: set[tuple[int, int]] = {start}
+	queue: list[tuple[int, int]] = [start]
+	for c, r in queue:
+		for tile in ((c+i, r+j) for i in (-1, 0, 1) for j in (-1, 0, 1)):
+			if tile in numbers and tile not in region:
+				region.add(tile)
+				if numbers[tile] == 0:
+					queue.append(tile)
+	return region
+
+
+class BatchAgent(AI):
+	"""Plays a fixed list of batches and records every list of percepts it is given."""
+	def __init__(self, batches: list[list[Action]]):
+		self.batches: list[list[Action]] = batches
+		self.percepts: list[list[int]] = []
+		self.revealed: list[list[tuple[int, int, int]]] = []
+
+
+	def getAction(self, number: int) -> Action:
+		raise AssertionError("Agents with getActions play in batches")
+
+
+	def getActions(self, percepts: list[int], revealed: list[tuple[int, int, int]] = None) -> list[Action]:
+		self.percepts.append(percepts)
+		if revealed is not None:
+			self.revealed.append(revealed)
+		return self.batches.pop(0) if self.batches else []
+
+
+class WorldTest(unittest.TestCase):
+	def setUp(self):
+		self.world = WorldGenerator(16, 30, 60, seed=5).generate()
+		self.numbers: dict[tuple[int, int], int] = numbers(self.world)
+
+
+	def play(self, agent: AI, **kwargs) -> World:
+		world = World(record=self.world, agentFactory=lambda *args: agent, quiet=True, **kwargs)
+		world.run()
+		return world
+
+
+	def testBatchPerceptOrder(self):
+		rng = random.Random(0)
+		safeTiles: list[tuple[int, int]] = rng.sample(sorted(self.numbers), 20)
+		mine: tuple[int, int] = next(
+			(c, r) for c in range(self.world.cols) for r in range(self.world.rows) if (c, r) not in self.numbers
+		)
+		# A flag answers -1 and an invalid move repeats the percept before it
+		batch: list[Action] = [Action(AI.Action.UNCOVER, c, r) for c, r in safeTiles[:10]]
+		batch.append(Action(AI.Action.FLAG, *mine))
+		batch.append(Action(AI.Action.UNCOVER, self.world.cols, 0))
+		batch.extend(Action(AI.Action.UNCOVER, c, r) for c, r in safeTiles[10:])
+		agent = BatchAgent([batch])
+		world = self.play(agent)
+
+		expected: list[int] = [self.numbers[t] for t in safeTiles[:10]] + [-1, -1] + [self.numbers[t] for t in safeTiles[10:]]
+		start: tuple[int, int] = (self.world.startX, self.world.startY)
+		self.assertEqual(agent.percepts, [[self.numbers[start]], expected])
+		# The invalid move is not counted
+		self.assertEqual(world.getMovesMade(), len(batch) - 1)
+
+
+
+	def testFloodFill(self):
+		start: tuple[int, int] = (self.world.startX, self.world.startY)
+		opening: set[tuple[int, int]] = zeroRegion(self.numbers, start)
+		other: tuple[int, int] = next(t for t, n in sorted(self.numbers.items()) if n == 0 and t not in opening)
+		agent = BatchAgent([[Action(AI.Action.UNCOVER, *other)]])
+		world = self.play(agent, floodFill=True)
+
+		# Tiles are passed on once, without the tile the move uncovered
+		self.assertEqual(len(agent.revealed), 2)
+		self.assertEqual(sorted(agent.revealed[0]), sorted((c, r, self.numbers[c, r]) for c, r in opening - {start}))
+		region: set[tuple[int, int]] = zeroRegion(self.numbers, other) - opening - {other}
+		self.assertEqual(sorted(agent.revealed[1]), sorted((c, r, self.numbers[c, r]) for c, r in region))
+		self.assertEqual(agent.percepts, [[0], [0]])
+		self.assertEqual(world.getScore(), len(opening | zeroRegion(self.numbers, other)))
+
+
+if __name__ == "__main__":
+	unittest.main()